@@ -0,0 +1,4 @@
+"""
+The benchmarks of the gears. They are not a part of the package, run them from
+the repository root, e.g. `python -m benchmarks.onchange_init` (see `common`).
+"""
@@ -0,0 +1,33 @@
+"""
+The helpers of the benchmarks. They measure the `src` of the repository, set
+GEARS_SRC to the `src` of another revision to compare them:
+
+    git worktree add /tmp/gears-old <revision>
+    GEARS_SRC=/tmp/gears-old/src python -m benchmarks.onchange_init
+    python -m benchmarks.onchange_init
+"""
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    """Put the measured gears on the path and set up Django, call it before imports."""
+    sys.path.insert(0, os.environ.get('GEARS_SRC') or os.path.join(ROOT, 'src'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    django.setup()
+
+
+def best_of(func, number: int, repeat: int = 5) -> float:
+    """The best time (seconds) of a single call out of `repeat` rounds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def get_int_arg(position: int, default: int) -> int:
+    try:
+        return int(sys.argv[position])
+    except IndexError:
+        return default
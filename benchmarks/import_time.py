@@ -0,0 +1,87 @@
+"""
+The import time of the gears measured by `python -X importtime`. Every statement
+runs in a fresh interpreter after Django is set up and the DRF modules, which every
+DRF project loads anyway, are imported. The cumulative time of the modules the
+statement imports is reported with the number of the cryptography and simplejwt
+modules it pulls in.
+
+    python -m benchmarks.import_time [repeat]
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.common import ROOT, get_int_arg
+
+STATEMENTS = (
+    'import gears',
+    'from gears import ConditionalQuerysetMixin',
+    'from gears import SerializersMixin, PermissionsMixin',
+    'from gears import APIRenderer',
+    'from gears import TokenEncryption',
+    'from gears import *',  # every gear, as an eager `__init__` would import them
+    'import gears.viewsets.querysets',
+    'import gears.renderers.renderer',
+)
+
+MARKER = 'gears-benchmark-start'
+
+SCRIPT = f'''
+import sys
+sys.path.insert(0, sys.argv[1])
+import django
+from django.conf import settings
+settings.configure(
+    SECRET_KEY='gears-benchmarks-secret-key-which-is-long-enough',
+    INSTALLED_APPS=[
+        'django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework',
+    ],
+    JWT_PAYLOAD_ENCRYPTION_KEY=b'eT4xAYx1QTynivq1wgSAl-X6bTqWWeMvg2vwWolSkbY=',
+)
+django.setup()
+import rest_framework.serializers, rest_framework.renderers, rest_framework.viewsets
+sys.stderr.write('{MARKER}\\n')
+sys.stderr.flush()
+exec(sys.argv[2])
+heavy = ('cryptography', 'rest_framework_simplejwt')
+print(len([name for name in sys.modules if name.split('.')[0] in heavy]))
+'''
+
+
+def measure(src: str, statement: str):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCRIPT, src, statement],
+        capture_output=True, text=True,
+    )
+    if result.returncode:
+        return None, None
+    lines = result.stderr.split(MARKER, 1)[1].splitlines()
+    total = 0
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):  # the top-level imports only
+            total += int(cumulative)
+    return total, int(result.stdout)
+
+
+def main():
+    src = os.environ.get('GEARS_SRC') or os.path.join(ROOT, 'src')
+    repeat = get_int_arg(1, 5)
+    print(f'the best of {repeat} runs: cumulative import time, crypto/jwt modules')
+    for statement in STATEMENTS:
+        timings, heavy = [], None
+        for _ in range(repeat):
+            total, heavy = measure(src, statement)
+            if total is None:
+                break
+            timings.append(total)
+        if not timings:
+            print(f'{statement:<55} failed')
+            continue
+        print(f'{statement:<55} {min(timings) / 1000:7.1f} ms {heavy:4}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+from django.db import models
+
+from gears.models.change import OnChangeModel
+
+
+class PlainProduct(models.Model):
+    name = models.CharField(max_length=50, default='')
+    sku = models.CharField(max_length=20, default='')
+    price = models.IntegerField(default=0)
+    qty = models.IntegerField(default=0)
+    note = models.TextField(default='')
+    active = models.BooleanField(default=True)
+
+
+class OnChangeProduct(OnChangeModel):
+    name = models.CharField(max_length=50, default='')
+    sku = models.CharField(max_length=20, default='')
+    price = models.IntegerField(default=0)
+    qty = models.IntegerField(default=0)
+    note = models.TextField(default='')
+    active = models.BooleanField(default=True)
+
+    on_change_fields = ('qty',)
+
+    def on_change_name(self, old, new, adding):
+        pass
+
+    def post_change_price(self, old, new, adding):
+        pass
+
+
+try:
+    from gears.models.jwt import JWTUserModelMixin
+except ImportError:  # cryptography or simplejwt is not installed
+    JWTUserModelMixin = None
+
+if JWTUserModelMixin is not None:
+    class TokenUser(JWTUserModelMixin, models.Model):
+        email = models.CharField(max_length=50, default='')
+        address = models.CharField(max_length=100, default='')
+
+        def get_public_jwt_data(self) -> dict:
+            return {'email': self.email}
+
+        def get_private_jwt_data(self) -> dict:
+            return {'address': self.address, 'roles': ['reader', 'writer']}
@@ -0,0 +1,36 @@
+"""
+The instantiation cost of the OnChangeModel rows, the way a queryset builds them
+(`Model.from_db`), next to a plain model with the same fields.
+
+    python -m benchmarks.onchange_init [rows]
+"""
+from benchmarks.common import best_of, get_int_arg, setup
+
+setup()
+
+from benchmarks.models import OnChangeProduct, PlainProduct  # noqa: E402
+
+
+def get_rows(count: int) -> list:
+    return [
+        (i, f'name {i}', f'sku-{i}', i, i % 10, 'x' * 50, True) for i in range(count)
+    ]
+
+
+def main():
+    rows = get_rows(get_int_arg(1, 10000))
+    print(f'{len(rows)} rows, the best of 5 rounds')
+    for model in (PlainProduct, OnChangeProduct):
+        field_names = [f.attname for f in model._meta.concrete_fields]
+        from_db = model.from_db
+
+        def instantiate():
+            for row in rows:
+                from_db('default', field_names, row)
+
+        per_row = best_of(instantiate, number=1) / len(rows)
+        print(f'{model.__name__:<16} {per_row * 1e6:8.2f} us/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+The memory of the OnChangeModel instances measured by tracemalloc, next to a plain
+model with the same fields. The rows are built by `Model.from_db`, as a queryset
+builds them, and kept in a list, as an export does.
+
+    python -m benchmarks.onchange_memory [rows]
+"""
+import gc
+import tracemalloc
+
+from benchmarks.common import get_int_arg, setup
+
+setup()
+
+from benchmarks.models import OnChangeProduct, PlainProduct  # noqa: E402
+
+
+def measure(model, rows: list) -> float:
+    field_names = [f.attname for f in model._meta.concrete_fields]
+    model.from_db('default', field_names, rows[0])  # warm up the class-level caches
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [model.from_db('default', field_names, row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del instances
+    return size / len(rows)
+
+
+def main():
+    count = get_int_arg(1, 100000)
+    # the values are shared by the models, so the instances are measured only
+    rows = [(i, 'name', 'sku', i, i % 10, 'note', True) for i in range(count)]
+    print(f'{count} rows')
+    for model in (PlainProduct, OnChangeProduct):
+        print(f'{model.__name__:<16} {measure(model, rows):8.0f} bytes/instance')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+The size and the throughput of the APIRenderer envelope in JSON, MessagePack and
+CBOR for a representative list payload: the rendered size, the zlib-compressed
+size (as a gzip middleware sends it), the render time and the decode time.
+
+    python -m benchmarks.renderers [rows]
+"""
+import datetime
+import json
+import uuid
+import zlib
+from decimal import Decimal
+
+from benchmarks.common import best_of, get_int_arg, setup
+
+setup()
+
+from rest_framework.response import Response  # noqa: E402
+
+from gears.renderers.renderer import APIRenderer, FastAPIRenderer  # noqa: E402
+
+try:
+    from gears.renderers.binary import (
+        CBORRenderer,
+        MessagePackRenderer,
+        cbor2,
+        msgpack,
+    )
+except ImportError:  # a revision without the binary renderers
+    cbor2 = msgpack = None
+
+
+def get_payload(rows: int) -> dict:
+    created = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    return {
+        'count': rows,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': str(uuid.UUID(int=i)),
+                'name': f'Product {i}',
+                'price': str(Decimal(i) / 4),
+                'qty': i % 17,
+                'rating': i / 7,
+                'active': i % 3 != 0,
+                'tags': ['new', 'sale'][:i % 3],
+                'created': created.isoformat(),
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def main():
+    rows = get_int_arg(1, 50)
+    data = get_payload(rows)
+    context = {'response': Response()}
+    renderers = [
+        ('APIRenderer', APIRenderer(), json.loads),
+        ('FastAPIRenderer', FastAPIRenderer(), json.loads),
+    ]
+    if msgpack is not None:
+        renderers.append(('MessagePackRenderer', MessagePackRenderer(), msgpack.unpackb))
+    if cbor2 is not None:
+        renderers.append(('CBORRenderer', CBORRenderer(), cbor2.loads))
+    print(f'{rows} rows, the best of 5 rounds')
+    print(f"{'':<20} {'size':>8} {'zlib':>8} {'render':>10} {'decode':>10}")
+    for name, renderer, loads in renderers:
+        content = renderer.render(data, renderer.media_type, context)
+        render = best_of(lambda: renderer.render(data, renderer.media_type, context), 200)
+        decode = best_of(lambda: loads(content), 200)
+        print(
+            f'{name:<20} {len(content):>6} B {len(zlib.compress(content)):>6} B '
+            f'{render * 1e6:>7.0f} us {decode * 1e6:>7.0f} us'
+        )
+
+
+if __name__ == '__main__':
+    main()
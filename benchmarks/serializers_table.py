@@ -0,0 +1,58 @@
+"""
+The serializer resolution of SerializersMixin for a ViewSet with the CRUD and
+many custom actions: the `get_serializer_class` time per call (averaged over all
+the actions) and the ViewSet instantiation, which DRF does for every request.
+
+    python -m benchmarks.serializers_table [actions]
+"""
+from benchmarks.common import best_of, get_int_arg, setup
+
+setup()
+
+from rest_framework import serializers, viewsets  # noqa: E402
+
+from gears.viewsets.serializers import SerializersMixin  # noqa: E402
+
+CRUD_ACTIONS = ('list', 'retrieve', 'create', 'update', 'partial_update', 'destroy')
+
+
+def get_serializer(name: str):
+    return type(name, (serializers.Serializer,), {})
+
+
+def get_viewset(custom_actions: int):
+    actions = [f'action_{i}' for i in range(custom_actions)]
+    table = {
+        None: get_serializer('DefaultSerializer'),
+        'list': get_serializer('ListSerializer'),
+        'read_only': get_serializer('ReadSerializer'),
+        'write_only': get_serializer('WriteSerializer'),
+    }
+    # every other custom action falls back to the default serializer
+    table.update({name: get_serializer(f'{name}Serializer') for name in actions[::2]})
+    viewset = type(
+        'BenchmarkViewSet',
+        (SerializersMixin, viewsets.GenericViewSet),
+        {'serializers': table},
+    )
+    return viewset, [*CRUD_ACTIONS, *actions]
+
+
+def main():
+    viewset, actions = get_viewset(get_int_arg(1, 30))
+    view = viewset()
+    number = 10000
+
+    def resolve():
+        for action in actions:
+            view.action = action
+            view.get_serializer_class()
+
+    per_call = best_of(resolve, number=number // 10) / len(actions)
+    print(f'{len(actions)} actions, the best of 5 rounds')
+    print(f'{"get_serializer_class":<22} {per_call * 1e9:8.0f} ns/call')
+    print(f'{"ViewSet()":<22} {best_of(viewset, number=number) * 1e9:8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
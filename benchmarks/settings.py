@@ -0,0 +1,17 @@
+SECRET_KEY = 'gears-benchmarks-secret-key-which-is-long-enough'
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'rest_framework',
+    'benchmarks',
+]
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+USE_TZ = True
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+# the key of the benchmarks only
+JWT_PAYLOAD_ENCRYPTION_KEY = b'eT4xAYx1QTynivq1wgSAl-X6bTqWWeMvg2vwWolSkbY='
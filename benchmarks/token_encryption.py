@@ -0,0 +1,49 @@
+"""
+The throughput of the token issuance (`JWTUserModelMixin.get_tokens_pair`) and of
+the private payload encryption, with a single key and with the rotated keys
+(the data of the older key is decrypted).
+
+    python -m benchmarks.token_encryption [number]
+"""
+from benchmarks.common import best_of, get_int_arg, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+
+from benchmarks.models import TokenUser  # noqa: E402
+from gears.models.jwt import TokenEncryption  # noqa: E402
+
+
+def report(name: str, per_call: float):
+    print(f'{name:<36} {1 / per_call:10.0f} /s {per_call * 1e6:8.1f} us')
+
+
+def main():
+    number = get_int_arg(1, 2000)
+    print(f'the best of 5 rounds of {number} calls')
+    user = TokenUser(id=1, email='user@example.com', address='Baker Street 221b')
+    report('get_tokens_pair', best_of(user.get_tokens_pair, number))
+
+    data = user.get_private_jwt_data()
+    encrypted = TokenEncryption.encrypt_data(data)
+    report('encrypt_data', best_of(lambda: TokenEncryption.encrypt_data(data), number))
+    report(
+        'decrypt_data',
+        best_of(lambda: TokenEncryption.decrypt_data(encrypted), number),
+    )
+
+    keys = [TokenEncryption.generate_key(), settings.JWT_PAYLOAD_ENCRYPTION_KEY]
+    try:
+        TokenEncryption.decrypt_data(encrypted, keys)
+    except Exception:  # the keys rotation isn't supported
+        print(f"{'decrypt_data (the older key)':<36} not supported")
+        return
+    report(
+        'decrypt_data (the older key)',
+        best_of(lambda: TokenEncryption.decrypt_data(encrypted, keys), number),
+    )
+
+
+if __name__ == '__main__':
+    main()
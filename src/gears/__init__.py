@@ -0,0 +1,73 @@
+"""
+The gears are resolved lazily, so importing one of them doesn't pull in the
+dependencies of the others (e.g. cryptography or simplejwt for the JWT gears).
+
+    from gears import ConditionalQuerysetMixin, SerializersMixin
+"""
+from importlib import import_module
+
+_gears = {
+    # models
+    'OnChangeModel': 'gears.models.change',
+    'OnChangeQuerySet': 'gears.models.change',
+    'OnChangeManager': 'gears.models.change',
+    'SingletonModel': 'gears.models.singleton',
+    'TokenEncryption': 'gears.models.jwt',
+    'JWTUserModelMixin': 'gears.models.jwt',
+    'JWTRefreshToken': 'gears.models.jwt',
+    # admin
+    'SingletonModelAdmin': 'gears.admin.singleton',
+    # authentication
+    'JWTAuthentication': 'gears.authentication.jwt',
+    'JWTStatelessAuthentication': 'gears.authentication.jwt',
+    'JWTTokenUser': 'gears.authentication.jwt',
+    # renderers
+    'APIRenderer': 'gears.renderers.renderer',
+    'FastAPIRenderer': 'gears.renderers.renderer',
+    'MessagePackRenderer': 'gears.renderers.binary',
+    'CBORRenderer': 'gears.renderers.binary',
+    'Error': 'gears.renderers.types',
+    'ExceptionHandler': 'gears.renderers.exception_handlers',
+    'exception_handler': 'gears.renderers.exception_handlers',
+    # viewsets
+    'ConditionalGetMixin': 'gears.viewsets.conditional_get',
+    'ConditionalQuerysetMixin': 'gears.viewsets.querysets',
+    'CachedResponseMixin': 'gears.viewsets.response_cache',
+    'PermissionsMixin': 'gears.viewsets.permissions',
+    'QueryInspectionMixin': 'gears.viewsets.query_inspection',
+    'inspect_view_queries': 'gears.viewsets.query_inspection',
+    'SerializersMixin': 'gears.viewsets.serializers',
+    'StreamingListMixin': 'gears.viewsets.streaming',
+    'ServiceDataViewSetMixin': 'gears.viewsets.service_data',
+    # pagination
+    'SummaryPaginationMixin': 'gears.pagination.summary',
+    # jwt
+    'JWTObtainPairSerializer': 'gears.serializers.jwt',
+    'JWTRefreshSerializer': 'gears.serializers.jwt',
+    'JWTObtainPairView': 'gears.views.jwt',
+    'JWTRefreshView': 'gears.views.jwt',
+    # exceptions
+    'GearsViewException': 'gears.exceptions.views',
+    'QueryInspectionError': 'gears.exceptions.views',
+}
+
+_aliases = {
+    'ApiRenderer': 'APIRenderer',
+}
+
+__all__ = [*_gears, *_aliases]
+
+
+def __getattr__(name: str):
+    attr_name = _aliases.get(name, name)
+    try:
+        module_name = _gears[attr_name]
+    except KeyError:
+        raise AttributeError(f"module 'gears' has no attribute '{name}'") from None
+    value = getattr(import_module(module_name), attr_name)
+    globals()[name] = value  # resolve it once
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
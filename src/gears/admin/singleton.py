@@ -5,19 +5,22 @@ from django.urls import path
 class SingletonModelAdmin(admin.ModelAdmin):
     def get_urls(self):
         urlpatterns = super().get_urls()
-        try:
-            model_name = self.model.__class__.__name__.lower()
-            custom_urlpatterns = [
-                path(r'',
-                     self.admin_site.admin_view(self.change_view),
-                     {'object_id': str(self.model.get().pk)},
-                     name=f'{self.model._meta.app_label}_{model_name}_change',
-                     ),
-            ]
-        except AttributeError as e:
-            custom_urlpatterns = []
+        model_name = self.model.__class__.__name__.lower()
+        custom_urlpatterns = [
+            path(r'',
+                 self.admin_site.admin_view(self.singleton_change_view),
+                 name=f'{self.model._meta.app_label}_{model_name}_change',
+                 ),
+        ]
         return custom_urlpatterns + urlpatterns
 
+    def singleton_change_view(self, request, form_url='', extra_context=None):
+        # the object is resolved on request, not on the URLconf loading
+        obj = self.model.get()
+        return self.change_view(
+            request, str(obj.pk), form_url=form_url, extra_context=extra_context,
+        )
+
     def has_add_permission(self, request):
         return False
 
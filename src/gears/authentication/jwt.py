@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from copy import copy
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from ..models.jwt import PRIVATE_CLAIM, TokenEncryption
+from ..settings import get_settings
+
+_MISSING = object()
+
+
+class PrivateDataCache:
+    """
+    A thread-safe LRU cache of the decrypted private token payloads, which are keyed
+    by the token `jti`. An entry lives `ttl` seconds at most, and never outlives
+    the token expiration.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now: float):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, now: float, exp: float = None):
+        expires_at = now + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._data[key] = expires_at, value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_private_data_cache() -> PrivateDataCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                conf = get_settings()
+                _cache = PrivateDataCache(
+                    conf['jwt_private_cache_size'], conf['jwt_private_cache_ttl'],
+                )
+    return _cache
+
+
+def get_private_data(token) -> dict:
+    """
+    Decrypt the private payload of the token built by JWTUserModelMixin.
+    The result is memoized by the token `jti` till the token expiration.
+    :param token: a validated simplejwt token
+    :return: a payload dict
+    """
+    encrypted = token.get(PRIVATE_CLAIM)
+    if encrypted is None:
+        return {}
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        return TokenEncryption.decrypt_data(encrypted)
+    cache, now = get_private_data_cache(), time.time()
+    data = cache.get(jti, now)
+    if data is _MISSING:
+        data = TokenEncryption.decrypt_data(encrypted)
+        cache.set(jti, data, now, token.get('exp'))
+    return copy(data)  # protect the cached payload from changes
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    This is a companion of JWTObtainPairSerializer for reading the tokens.
+    It exposes the decrypted private payload as `request.auth.private_data`. The
+    payload is decrypted lazily, on the first access, and memoized by the token `jti`.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        token.private_data = SimpleLazyObject(partial(get_private_data, token))
+        return token
+
+
+class JWTTokenUser:
+    """
+    A lightweight read-only user built from the token claims, which are written by
+    JWTUserModelMixin: the public payload and, optionally, the private one.
+    Accessing an attribute which isn't in the claims loads the real user instance
+    once (see `get_instance`) and takes the attribute from it.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token, include_private_data: bool = False):
+        self.__dict__.update(
+            _token=token,
+            _include_private_data=include_private_data,
+            _private_data=None,
+            _instance=None,
+        )
+
+    @property
+    def _meta(self):
+        return get_user_model()._meta
+
+    @property
+    def pk(self):
+        value = self._token[api_settings.USER_ID_CLAIM]
+        return get_user_model()._meta.pk.to_python(value)
+
+    def get_instance(self):
+        """
+        The escape hatch: it loads the real user instance on the first call.
+        """
+        if self._instance is None:
+            user_id = self._token[api_settings.USER_ID_CLAIM]
+            self.__dict__['_instance'] = get_user_model()._default_manager.get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        return self._instance
+
+    def __getattr__(self, name: str):
+        # it's called for the attributes which are not found in the usual way
+        if name in JWTTokenUser.__dict__ or name in (
+            '_token', '_include_private_data', '_private_data', '_instance',
+        ):
+            raise AttributeError(name)
+        if name == api_settings.USER_ID_FIELD:
+            return self.pk
+        payload = self._token.payload
+        if name in payload and name != PRIVATE_CLAIM:
+            return payload[name]
+        if self._include_private_data:
+            if self._private_data is None:
+                self.__dict__['_private_data'] = get_private_data(self._token)
+            if name in self._private_data:
+                return self._private_data[name]
+        return getattr(self.get_instance(), name)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError('JWTTokenUser is read-only')
+
+    def save(self, *args, **kwargs):
+        raise NotImplementedError('JWTTokenUser is read-only')
+
+    def delete(self, *args, **kwargs):
+        raise NotImplementedError('JWTTokenUser is read-only')
+
+    def __eq__(self, other):
+        if isinstance(other, JWTTokenUser):
+            return self.pk == other.pk
+        return getattr(other, 'pk', None) == self.pk and isinstance(
+            other, get_user_model(),
+        )
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f'JWTTokenUser {self.pk}'
+
+
+class JWTStatelessAuthentication(JWTAuthentication):
+    """
+    The opt-in authentication, which doesn't hit the database. It builds
+    a JWTTokenUser from the token claims instead of loading the user.
+    Keep on mind, the user state (e.g. `is_active` or a changed password) is not
+    checked till the token expiration.
+
+    include_private_data -- if True, the private payload is used as the claims as well.
+    """
+
+    user_class = JWTTokenUser
+    include_private_data = False
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        return self.user_class(validated_token, self.include_private_data)
@@ -1,2 +1,24 @@
 class GearsViewException(Exception):
     pass
+
+
+class EarlyResponse(GearsViewException):
+    """
+    It stops the view processing with the ready response. The ViewSet mixins raise
+    it from `initial` and return the response from `handle_exception`.
+    """
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class QueryInspectionError(GearsViewException):
+    """
+    The view has exceeded its query budget or has made the repeated (N+1) queries.
+    The `QueryReport` of the request is in `.report`.
+    """
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report
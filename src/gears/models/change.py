@@ -1,6 +1,35 @@
-from typing import List, Tuple, Set
+import inspect
+from typing import Dict, Iterable, List, Tuple, Set
 
-from django.db import models
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
+
+_NOT_LOADED = object()  # the origin value of a deferred field which isn't loaded yet
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _resolve(result):
+    # wait for the result of an async method called from the sync code
+    if inspect.isawaitable(result):
+        return async_to_sync(_await)(result)
+    return result
+
+
+async def _acall(method, *args):
+    # the coroutine hooks run in the event loop, the sync ones run in a thread,
+    # so they could use the ORM
+    if getattr(method, '__func__', None) in _NOOP_HOOKS:
+        return None
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    result = await sync_to_async(method)(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
 
 
 class OnChangeModel(models.Model):
@@ -25,7 +54,38 @@ class OnChangeModel(models.Model):
     separated method.
 
     on_change_prefix -- a prefix for methods naming.
-    origin_prefix -- a prefix for attributes where serves the origin values.
+    origin_prefix -- a prefix for names of the origin values.
+    track_called_methods -- if False, the called methods are not recorded and
+    `is_called` always returns False.
+    post_change_on_commit -- if True, the post_change methods and `after_save` of the
+    objects saved inside a transaction are postponed till the commit. Multiple saves of
+    the same object are merged (the first origin value -> the last saved value), so the
+    methods run once, and the objects are processed in batches by `bulk_post_change`.
+    Nothing runs if the transaction is rolled back.
+    update_changed_fields_only -- if True, the origin values of all the concrete fields
+    are tracked and `save()` of an existing object writes the fields changed since
+    the last save or refresh only (fields with `auto_now` are always written with them).
+    If nothing has changed, the query is skipped at all. It doesn't work if you pass
+    `update_fields` by yourself. The change methods still compare with the origin values.
+
+    The change methods and `after_save` could be coroutines. `asave` awaits them in the
+    event loop and runs the sync ones and the database write in a thread, so the sync
+    methods could use the ORM, while `save` waits for the coroutines synchronously.
+    If a model overrides `save`, `asave` calls it in a thread instead.
+
+    The hook methods and the tracked fields are collected once per model class
+    (see `get_change_registry`), so instantiating a model doesn't scan its attributes.
+    The origin values are kept in a single tuple aligned with the class-level index of
+    the tracked fields, followed by the save counter and the called methods list.
+
+    The foreign keys are tracked by their columns (e.g. `author_id`), so instantiating
+    a model doesn't load the related objects. They are loaded for the change methods
+    and `get_origin_value` only, when the key has changed.
+
+    Deferred fields (`.only()`/`.defer()`) are not loaded for the origin values. Their
+    origin values are taken when they are loaded, and a deferred field which has never
+    been loaded is treated as unchanged. If you set a deferred field without loading it,
+    its origin value is unknown and None is used instead.
     """
 
     # It would be nice to make a decorator @on_change(field1, field2...)
@@ -35,30 +95,78 @@ class OnChangeModel(models.Model):
     post_change_fields = ()
     post_change_prefix = 'post_change_'
     origin_prefix = '__origin_'
+    update_changed_fields_only = False
+    track_called_methods = True
+    post_change_on_commit = False
+    __state_adding = None  # it's set by the save method
+    __saved = None  # the last saved values of the dirty-tracked fields, set on save
 
     class Meta:
         abstract = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._on_change_fields = self.get_on_change_fields()
-        self._post_change_fields = self.get_post_change_fields()
-        self.__state_adding = None
-        fields = self._on_change_fields + self._post_change_fields
-        for name in set(fields):
-            setattr(self, self.get_origin_name(name), getattr(self, name, None))
-        setattr(self, self.get_origin_name('counter'), 0)
-        setattr(self, self.get_origin_name('called_methods'), [])
+        self.__origin = (
+            *(
+                _NOT_LOADED if self._is_deferred(name) else self._get_tracked_value(name)
+                for name in self.get_tracked_fields()
+            ),
+            0,  # the save counter
+            None,  # the called methods list, it's created on demand
+        )
 
     def save(self, *args, **kwargs):
         # fix the adding state to be actual for post_change method
         self.__state_adding: bool = self._state.adding
 
         self.process_changed_fields(self.on_change_prefix, *args, **kwargs)
+        if self._can_update_changed_fields(*args, **kwargs):
+            kwargs['update_fields'] = self.get_dirty_fields()
         super().save(*args, **kwargs)
+        self._mark_saved(kwargs.get('update_fields'))
+        if self._can_postpone_post_change():
+            self._postpone_post_change(kwargs.get('update_fields'))
+            self._increase_counter()
+            return
         self.process_changed_fields(self.post_change_prefix, *args, **kwargs)
         self._increase_counter()
-        self.after_save()
+        _resolve(self.after_save())
+
+    async def asave(self, *args, **kwargs):
+        if type(self).save is not OnChangeModel.save:
+            # the overridden save must run, so it does the whole work in a thread
+            return await sync_to_async(self.save)(*args, **kwargs)
+
+        # fix the adding state to be actual for post_change method
+        self.__state_adding: bool = self._state.adding
+
+        await self.aprocess_changed_fields(self.on_change_prefix, *args, **kwargs)
+        if self._can_update_changed_fields(*args, **kwargs):
+            kwargs['update_fields'] = self.get_dirty_fields()
+        await sync_to_async(super().save)(*args, **kwargs)
+        self._mark_saved(kwargs.get('update_fields'))
+        if self._can_postpone_post_change():
+            self._postpone_post_change(kwargs.get('update_fields'))
+            self._increase_counter()
+            return
+        await self.aprocess_changed_fields(self.post_change_prefix, *args, **kwargs)
+        self._increase_counter()
+        await _acall(self.after_save)
+
+    asave.alters_data = True
+
+    def refresh_from_db(self, *args, **kwargs):
+        # take the origin values of the deferred fields once they are loaded
+        deferred = [
+            name for name in self.get_tracked_fields() if self._is_deferred(name)
+        ]
+        super().refresh_from_db(*args, **kwargs)
+        for name in deferred:
+            if not self._is_deferred(name):
+                index = self._origin_index[self.get_origin_name(name)]
+                self.__set_origin(index, self._get_tracked_value(name))
+        fields = kwargs.get('fields', args[1] if len(args) > 1 else None)
+        self._mark_saved(fields)  # the loaded values are the database ones
 
     def execute_change_method(
             self, prefix, origin_name, origin_value, name, value,
@@ -82,6 +190,20 @@ class OnChangeModel(models.Model):
         if not method:
             return True  # must be processed by the main on_change method
         _status = method(origin_value, value, self.__state_adding)  # kwargs could be sent
+        return self._finish_change_method(method, _resolve(_status))
+
+    async def aexecute_change_method(
+            self, prefix, origin_name, origin_value, name, value,
+    ) -> bool:
+        """The async version of `execute_change_method`"""
+        method = self._get_method(prefix, name)
+        if not method:
+            return True  # must be processed by the main on_change method
+        # kwargs could be sent
+        _status = await _acall(method, origin_value, value, self.__state_adding)
+        return self._finish_change_method(method, _status)
+
+    def _finish_change_method(self, method, _status) -> bool:
         # This is a compatibility part. Previous lib version might return nothing.
         _status = True if _status is None else _status
         # set new value as original value preventing extra method execution
@@ -93,21 +215,86 @@ class OnChangeModel(models.Model):
         return f'{self.origin_prefix}{name}'
 
     def get_origin_value(self, origin_name):
-        return getattr(self, origin_name)
+        try:
+            value = self.__origin[self._origin_index[origin_name]]
+        except KeyError:
+            return getattr(self, origin_name)
+        if value is _NOT_LOADED:
+            raise AttributeError(f'{origin_name} is not loaded yet')
+        if value is None and origin_name == self.get_origin_name('called_methods'):
+            return []  # it's created on demand
+        field = self._origin_relations.get(origin_name)
+        if field is not None:
+            value = self._get_related_object(field, value)
+        return value
 
     def process_changed_fields(self, prefix, *args, **kwargs):
-        update_fields = kwargs.get('update_fields', [])
+        change_attrs = self.collect_changed_fields(prefix, kwargs.get('update_fields'))
+        _resolve(self.batch_change(prefix, change_attrs))
+
+    async def aprocess_changed_fields(self, prefix, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
         changed_fields = self.get_changed_fields(prefix)
+        if self._origin_relations:
+            # the related objects of the changed foreign keys could be loaded
+            changed_fields = await sync_to_async(list)(changed_fields)
         change_attrs = []
         for origin_name, origin_value, name, value in changed_fields:
-            if update_fields and name not in update_fields:
+            if update_fields and not self._is_updated(name, update_fields):
+                # exclude all another fields if we use the `update_fields` option
+                continue
+            attrs = origin_name, origin_value, name, value
+            status = await self.aexecute_change_method(prefix, *attrs)
+            if status is True:
+                change_attrs.append(attrs)
+        if type(self).batch_change is not OnChangeModel.batch_change:
+            await _acall(self.batch_change, prefix, change_attrs)
+        elif prefix == self.on_change_prefix:
+            await _acall(self.on_change, change_attrs, self.__state_adding)
+        elif prefix == self.post_change_prefix:
+            await _acall(self.post_change, change_attrs, self.__state_adding)
+
+    def collect_changed_fields(
+            self, prefix, update_fields=None, values: dict = None,
+    ) -> List[Tuple]:
+        """
+        Run the single field methods for the changed fields and collect the fields
+        which must be processed by the main on_change (post_change) method.
+        :param prefix: maybe on_change or post_change
+        :param update_fields: process these fields only, if provided
+        :param values: compare the origin values with these values instead of the
+        current ones, if provided
+        :return: a list of (origin_name, origin_value, name, value) tuples
+        """
+        change_attrs = []
+        changed_fields = self.get_changed_fields(prefix, values)
+        for origin_name, origin_value, name, value in changed_fields:
+            if update_fields and not self._is_updated(name, update_fields):
                 # exclude all another fields if we use the `update_fields` option
                 continue
             attrs = origin_name, origin_value, name, value
             status = self.execute_change_method(prefix, *attrs)
             if status is True:
                 change_attrs.append(attrs)
-        self.batch_change(prefix, change_attrs)
+        return change_attrs
+
+    @classmethod
+    def process_bulk_changed_fields(
+            cls, prefix, instances: Iterable['OnChangeModel'], adding: bool,
+            update_fields=None,
+    ):
+        """
+        The bulk version of `process_changed_fields`. It runs the single field methods
+        for every instance and passes the whole batch to the list-of-instances
+        variant of the main method in a single pass.
+        """
+        batch = []
+        for instance in instances:
+            instance.__state_adding = adding
+            batch.append(
+                (instance, instance.collect_changed_fields(prefix, update_fields))
+            )
+        _resolve(cls.bulk_batch_change(prefix, batch, adding))
 
     def after_save(self):
         """Customize it on your taste"""
@@ -119,6 +306,54 @@ class OnChangeModel(models.Model):
         elif prefix == self.post_change_prefix:
             return self.post_change(fields, self.__state_adding)  # kwargs could be sent
 
+    @classmethod
+    def process_postponed_post_change(cls, entries: List[list]):
+        """
+        Run the postponed post_change work of the objects saved inside a committed
+        transaction. The objects are grouped by model and adding state, and each group
+        is passed to `bulk_post_change` at once.
+        :param entries: a list of [instance, adding, update_fields, values] items
+        """
+        groups = {}
+        for instance, adding, update_fields, values in entries:
+            instance.__state_adding = adding
+            change_attrs = instance.collect_changed_fields(
+                instance.post_change_prefix, update_fields, values,
+            )
+            key = type(instance), adding
+            groups.setdefault(key, []).append((instance, change_attrs))
+        for (model, adding), batch in groups.items():
+            _resolve(model.bulk_batch_change(model.post_change_prefix, batch, adding))
+            for instance, _ in batch:
+                _resolve(instance.after_save())
+
+    @classmethod
+    def bulk_batch_change(cls, prefix: str, batch: List[Tuple], adding: bool):
+        if prefix == cls.on_change_prefix:
+            return cls.bulk_on_change(batch, adding)  # kwargs could be sent
+        elif prefix == cls.post_change_prefix:
+            return cls.bulk_post_change(batch, adding)  # kwargs could be sent
+
+    @classmethod
+    def bulk_on_change(cls, batch: List[Tuple], adding: bool, **kwargs):
+        """
+        The list-of-instances variant of the on_change method. It's used by the
+        OnChangeQuerySet bulk operations and takes a list of (instance, fields) pairs.
+        By default, it calls the on_change method of every instance, so override it
+        if you want to handle the whole batch at once.
+        """
+        for instance, fields in batch:
+            _resolve(instance.on_change(fields, adding))
+
+    @classmethod
+    def bulk_post_change(cls, batch: List[Tuple], adding: bool, **kwargs):
+        """
+        The list-of-instances variant of the post_change method.
+        See `bulk_on_change` for details.
+        """
+        for instance, fields in batch:
+            _resolve(instance.post_change(fields, adding))
+
     def on_change(self, fields: List[Tuple], adding: bool, **kwargs):
         """
         This method allows to implement the logic based on the whole
@@ -145,65 +380,449 @@ class OnChangeModel(models.Model):
         #     pass  # handle logic here
         pass
 
+    @classmethod
+    def get_change_registry(cls) -> Dict[str, Tuple[Tuple[str, ...], Dict[str, str]]]:
+        """
+        Collect the change hooks of the model class once and cache them on the class.
+        Every subclass builds its own registry, so inherited and overridden hooks are
+        respected.
+        :return: a dict like {prefix: (fields, {field_name: method_name})} for both
+        the on_change and the post_change prefixes.
+        """
+        registry = cls.__dict__.get('_change_registry')
+        if registry is None:
+            registry = {}
+            for prefix, extra_fields in (
+                    (cls.on_change_prefix, cls.on_change_fields),
+                    (cls.post_change_prefix, cls.post_change_fields),
+            ):
+                methods = {
+                    name: f'{prefix}{name}' for name in cls.get_change_methods(prefix)
+                }
+                # Combine manually added fields with the defined through method fields
+                fields = tuple(dict.fromkeys([*methods, *extra_fields]))
+                registry[prefix] = fields, methods
+            cls._change_registry = registry
+            cls._dirty_fields, cls._auto_now_fields = (), ()
+            if cls.update_changed_fields_only:
+                fields = [f for f in cls._meta.concrete_fields if not f.primary_key]
+                cls._dirty_fields = tuple(f.attname for f in fields)
+                cls._auto_now_fields = tuple(
+                    f.attname for f in fields if getattr(f, 'auto_now', False)
+                )
+            cls._tracked_fields = tuple(dict.fromkeys(
+                [name for fields, _ in registry.values() for name in fields]
+                + list(cls._dirty_fields)
+            ))
+            cls._field_aliases = {}  # the name and the attname of a field to each other
+            for field in cls._meta.concrete_fields:
+                if field.attname != field.name:
+                    cls._field_aliases[field.name] = field.attname
+                    cls._field_aliases[field.attname] = field.name
+            cls._tracked_attnames = {}
+            cls._origin_relations = {}  # the origin names of the foreign keys
+            for name in cls._tracked_fields:
+                try:
+                    field = cls._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                if field.concrete:
+                    cls._tracked_attnames[name] = field.attname
+                    if field.is_relation and field.attname != name:
+                        cls._origin_relations[cls.get_origin_name(cls, name)] = field
+            cls._origin_index = {
+                cls.get_origin_name(cls, name): i
+                for i, name in enumerate(cls._tracked_fields)
+            }
+            # the save counter and the called methods list follow the tracked fields
+            cls._origin_index[cls.get_origin_name(cls, 'counter')] = -2
+            cls._origin_index[cls.get_origin_name(cls, 'called_methods')] = -1
+        return registry
+
+    @classmethod
+    def get_tracked_fields(cls) -> Tuple[str, ...]:
+        if '_tracked_fields' not in cls.__dict__:
+            cls.get_change_registry()
+        return cls._tracked_fields
+
     def get_on_change_fields(self):
-        # Combine manually added fields with the defined through method fields
-        fields = self.get_change_methods(self.on_change_prefix)
-        fields.extend(self.on_change_fields)
-        return fields
+        return list(self.get_change_registry()[self.on_change_prefix][0])
 
     def get_post_change_fields(self):
-        # Combine manually added fields with the defined through method fields
-        fields = self.get_change_methods(self.post_change_prefix)
-        fields.extend(self.post_change_fields)
-        return fields
+        return list(self.get_change_registry()[self.post_change_prefix][0])
 
-    def get_change_methods(self, prefix):
+    @classmethod
+    def get_change_methods(cls, prefix):
         def is_change_method(a):
-            return a.startswith(prefix) and callable(getattr(self, a))
+            return a.startswith(prefix) and callable(getattr(cls, a, None))
         l = len(prefix)
-        return [attr[l:] for attr in dir(self) if is_change_method(attr)]
+        return [attr[l:] for attr in dir(cls) if is_change_method(attr)]
 
-    def get_changed_fields(self, prefix) -> Set[Tuple]:
-        if prefix == self.on_change_prefix:
-            fields = self._on_change_fields
-        elif prefix == self.post_change_prefix:
-            fields = self._post_change_fields
-        else:
+    def get_changed_fields(self, prefix, values: dict = None) -> Set[Tuple]:
+        try:
+            fields, _ = self.get_change_registry()[prefix]
+        except KeyError:
             raise AttributeError("Wrong prefix")
         for name in fields:
             origin_name = self.get_origin_name(name)
-            origin_value = self.get_origin_value(origin_name)
-            value = getattr(self, name)
+            origin_value = self.__origin[self._origin_index[origin_name]]
+            if origin_value is _NOT_LOADED:
+                if self._is_deferred(name):
+                    continue  # it has never been loaded, so it's unchanged
+                origin_value = None  # it has been set without loading
+            if values is None:
+                value = getattr(self, self._tracked_attnames.get(name, name))
+            else:
+                value = values.get(name, origin_value)
             if value != origin_value:
+                field = self._origin_relations.get(origin_name)
+                if field is not None:
+                    origin_value = self._get_related_object(field, origin_value)
+                    value = self._get_related_object(field, value)
                 yield origin_name, origin_value, name, value
 
+    def get_dirty_fields(self) -> List[str]:
+        """
+        It works with the `update_changed_fields_only` option only.
+        :return: a list of the concrete fields which differ from the last saved values
+        (the origin values before the first save), extended with the `auto_now` fields
+        if there is any changed field.
+        """
+        dirty = []
+        saved = self.__saved or {}
+        for name in self._dirty_fields:
+            if name in saved:
+                origin_value = saved[name]
+            else:
+                origin_value = self.__origin[
+                    self._origin_index[self.get_origin_name(name)]
+                ]
+            if origin_value is not _NOT_LOADED:
+                if getattr(self, name) != origin_value:
+                    dirty.append(name)
+            elif not self._is_deferred(name):
+                dirty.append(name)  # it has been set without loading
+        if dirty:
+            dirty.extend(name for name in self._auto_now_fields if name not in dirty)
+        return dirty
+
     def get_on_change_counter(self):
-        return self.get_origin_value(self.get_origin_name('counter'))
+        return self.__origin[-2]
 
     @property
     def is_saved(self):
         return self.get_on_change_counter() > 0
 
+    def _can_update_changed_fields(self, *args, **kwargs) -> bool:
+        return (
+            self.update_changed_fields_only
+            and not self._state.adding
+            and not args  # update_fields could be sent as a positional argument
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        )
+
+    def _can_postpone_post_change(self) -> bool:
+        return (
+            self.post_change_on_commit
+            and transaction.get_connection(self._state.db).in_atomic_block
+        )
+
+    def _postpone_post_change(self, update_fields):
+        using = self._state.db
+        update_fields = None if not update_fields else set(update_fields)
+        values = {
+            name: self._get_tracked_value(name)
+            for name in self.get_change_registry()[self.post_change_prefix][0]
+            if not self._is_deferred(name)
+        }
+        connection = transaction.get_connection(using)
+        level = tuple(connection.savepoint_ids)
+        queue = None
+        for sids, func, *_ in connection.run_on_commit:
+            if isinstance(func, _PostChangeQueue) and not func.called:
+                queue = func
+                break
+        if queue is None:
+            queue = _PostChangeQueue(level)
+            transaction.on_commit(queue, using=using)
+        if not queue.is_outer(level) and level not in queue.markers:
+            # Django drops the marker if the savepoint is rolled back
+            queue.markers.add(level)
+            transaction.on_commit(_SavepointMarker(queue, level), using=using)
+            # the queue is called after the markers of its savepoints
+            callbacks = connection.run_on_commit
+            index = next(i for i, item in enumerate(callbacks) if item[1] is queue)
+            callbacks.append(callbacks.pop(index))
+        queue.add(level, self, self.__state_adding, update_fields, values)
+
+    def _mark_saved(self, fields=None):
+        # move the dirty-tracking baseline to the values written (or loaded) right now,
+        # the origin values of the change methods are kept
+        if not self._dirty_fields:
+            return
+        saved = dict(self.__saved or {})
+        for name in self._dirty_fields:
+            if fields is not None and not self._is_updated(name, fields):
+                continue
+            if not self._is_deferred(name):
+                saved[name] = getattr(self, name)
+        self.__saved = saved
+
+    def _get_tracked_value(self, name: str):
+        # the foreign keys are tracked by their columns, so the related objects
+        # are not loaded
+        return getattr(self, self._tracked_attnames.get(name, name), None)
+
+    def _get_related_object(self, field, value):
+        # the related object of a tracked foreign key value, it's loaded on demand
+        if value is None:
+            return None
+        if getattr(self, field.attname) == value:
+            return getattr(self, field.name)  # the current one, it's cached usually
+        manager = field.related_model._base_manager.db_manager(self._state.db)
+        return manager.filter(**{field.target_field.attname: value}).first()
+
+    def _is_updated(self, name: str, update_fields) -> bool:
+        return name in update_fields or self._field_aliases.get(name) in update_fields
+
+    def _is_deferred(self, name: str) -> bool:
+        attname = self._tracked_attnames.get(name)
+        return attname is not None and attname not in self.__dict__
+
     def _get_method(self, prefix, field_name: str):
-        method_name = f'{prefix}{field_name}'
         try:
-            return getattr(self, method_name)
-        except AttributeError:
-            # f'OnChangeModel has no method {method_name}'
+            method_name = self.get_change_registry()[prefix][1][field_name]
+        except KeyError:
+            # f'OnChangeModel has no method {prefix}{field_name}'
             return
+        return getattr(self, method_name)
 
     def _increase_counter(self):
-        counter = self.get_on_change_counter()
-        setattr(self, self.get_origin_name('counter'), counter + 1)
+        self.__set_origin(-2, self.__origin[-2] + 1)
 
     def _add_called_method(self, method_name: str):
-        # can contain duplicates
-        called_methods = self.get_called_methods()
-        called_methods.append(method_name)
-        setattr(self, self.get_origin_name('called_methods'), called_methods)
+        if not self.track_called_methods:
+            return
+        if self.__origin[-1] is None:
+            self.__set_origin(-1, [])
+        self.__origin[-1].append(method_name)  # can contain duplicates
+
+    def __set_origin(self, index: int, value):
+        origin = list(self.__origin)
+        origin[index] = value
+        self.__origin = tuple(origin)
 
     def get_called_methods(self):
-        return self.get_origin_value(self.get_origin_name('called_methods'))
+        return self.__origin[-1] or []
         
     def is_called(self, method_name: str):
-        return method_name in self.get_called_methods()
\ No newline at end of file
+        return method_name in self.get_called_methods()
+
+
+# the hooks which do nothing, `asave` skips them
+_NOOP_HOOKS = {
+    OnChangeModel.on_change, OnChangeModel.post_change, OnChangeModel.after_save,
+}
+
+
+class _PostChangeQueue:
+    """
+    The postponed post_change work of the OnChangeModel objects saved inside
+    a transaction. It's registered by `transaction.on_commit` once per transaction.
+    The saves are kept by savepoint levels and merged when the queue is called,
+    so the saves of the rolled back savepoints (see `_SavepointMarker`) are skipped.
+    """
+
+    def __init__(self, level: tuple):
+        self.level = level  # the savepoint ids of the registration
+        self.markers = set()  # the levels with a registered marker
+        self.survived = set()  # the levels which markers have been called
+        self.counter = 0
+        self.called = False
+        # (level, id(instance)): [first, last, instance, adding, update_fields, values]
+        self.entries = {}
+
+    def is_outer(self, level: tuple) -> bool:
+        # the level is dropped with the queue itself only
+        return set(level) <= set(self.level)
+
+    def add(self, level: tuple, instance, adding, update_fields, values):
+        self.counter += 1
+        key = level, id(instance)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [
+                self.counter, self.counter, instance, adding, update_fields, values,
+            ]
+            return
+        # merge with the previous save: keep the adding state of the first one
+        entry[4] = _merge_update_fields(entry[4], update_fields)
+        entry[1], entry[5] = self.counter, values
+
+    def __call__(self):
+        self.called = True
+        merged = {}
+        for (level, key), entry in sorted(self.entries.items(), key=lambda i: i[1][0]):
+            if not self.is_outer(level) and level not in self.survived:
+                continue  # the savepoint has been rolled back
+            first, last, instance, adding, update_fields, values = entry
+            item = merged.get(key)
+            if item is None:
+                merged[key] = [last, instance, adding, update_fields, values]
+                continue
+            item[3] = _merge_update_fields(item[3], update_fields)
+            if last > item[0]:
+                item[0], item[4] = last, values
+        OnChangeModel.process_postponed_post_change(
+            [item[1:] for item in merged.values()]
+        )
+
+
+class _SavepointMarker:
+    """
+    It's registered by `transaction.on_commit` inside a savepoint, so it's called on
+    commit only if the savepoint hasn't been rolled back.
+    """
+
+    def __init__(self, queue: _PostChangeQueue, level: tuple):
+        self.queue = queue
+        self.level = level
+
+    def __call__(self):
+        self.queue.survived.add(self.level)
+
+
+def _merge_update_fields(first, second):
+    if first is None or second is None:
+        return None
+    return first | second
+
+
+class OnChangeQuerySet(models.QuerySet):
+    """
+    OnChangeQuerySet keeps the OnChangeModel hooks working for the bulk operations.
+    `bulk_create`, `bulk_update` and `update` compute the changed fields of all the
+    objects against their origin values, run the single field methods and the
+    list-of-instances variants of on_change/post_change (`bulk_on_change` and
+    `bulk_post_change`) in a single pass and write to the database in batches.
+
+    The values set by expressions (e.g. `F('price') + 1`) are read back after the
+    write, so the post_change methods get the new values. Their on_change methods are
+    not called, since the values are unknown before the write.
+
+    update_batch_size -- the number of the objects loaded and written at once by
+    the tracked `update`.
+
+    Use it through the OnChangeManager:
+
+        class MyModel(OnChangeModel):
+            objects = OnChangeManager()
+    """
+    update_batch_size = 1000
+
+    def bulk_create(self, objs, *args, **kwargs):
+        model = self.model
+        objs = list(objs)
+        model.process_bulk_changed_fields(model.on_change_prefix, objs, adding=True)
+        objs = self._untracked().bulk_create(objs, *args, **kwargs)
+        model.process_bulk_changed_fields(model.post_change_prefix, objs, adding=True)
+        self._after_save(objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        return self._tracked_bulk_update(list(objs), fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        """
+        The tracked update loads the objects by chunks of `update_batch_size` and
+        writes every chunk by `bulk_update`. It costs a SELECT and an UPDATE per chunk
+        instead of the single UPDATE of a plain queryset, so use a plain manager for
+        the large updates, which don't need the hooks.
+        """
+        if self.query.is_sliced:
+            raise TypeError('Cannot update a query once a slice has been taken.')
+        rows = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            # the primary key order, so the written rows are not met by the cursor again
+            objs = self.order_by('pk').iterator(chunk_size=self.update_batch_size)
+            for chunk in _chunks(objs, self.update_batch_size):
+                for obj in chunk:
+                    for k, v in kwargs.items():
+                        setattr(obj, k, v)
+                rows += self._tracked_bulk_update(chunk, list(kwargs))
+        return rows
+
+    update.alters_data = True
+
+    def _tracked_bulk_update(self, objs, fields, *args, **kwargs):
+        model = self.model
+        expressions = self._get_expression_fields(objs, fields)
+        on_change_fields = [name for name in fields if name not in expressions]
+        if on_change_fields:
+            model.process_bulk_changed_fields(
+                model.on_change_prefix, objs, adding=False,
+                update_fields=on_change_fields,
+            )
+        rows = self._untracked().bulk_update(objs, fields, *args, **kwargs)
+        if expressions:
+            self._read_back(objs, expressions)
+        model.process_bulk_changed_fields(
+            model.post_change_prefix, objs, adding=False, update_fields=fields,
+        )
+        self._after_save(objs, fields)
+        return rows
+
+    def _get_expression_fields(self, objs, fields) -> Dict[str, str]:
+        # field name: attname of the fields, which are set by expressions
+        expressions = {}
+        for name in fields:
+            attname = self.model._meta.get_field(name).attname
+            for obj in objs:
+                if hasattr(obj.__dict__.get(attname), 'resolve_expression'):
+                    expressions[name] = attname
+                    break
+        return expressions
+
+    def _read_back(self, objs, expressions: Dict[str, str]):
+        # not filtered by the query, the written values might not match it anymore
+        queryset = models.QuerySet(model=self.model, using=self.db)
+        rows = queryset.filter(pk__in=[obj.pk for obj in objs]).values_list(
+            'pk', *expressions,
+        )
+        values = {pk: row for pk, *row in rows}
+        for obj in objs:
+            row = values.get(obj.pk)
+            if row is None:
+                continue
+            for attname, value in zip(expressions.values(), row):
+                setattr(obj, attname, value)
+
+    def _untracked(self) -> models.QuerySet:
+        # a plain queryset, Django calls `update` inside `bulk_update` on its own
+        return models.QuerySet(
+            model=self.model, query=self.query.chain(), using=self._db,
+            hints=self._hints,
+        )
+
+    @staticmethod
+    def _after_save(objs: List[OnChangeModel], fields=None):
+        for obj in objs:
+            obj._mark_saved(fields)
+            obj._increase_counter()
+            _resolve(obj.after_save())
+
+
+class OnChangeManager(models.Manager.from_queryset(OnChangeQuerySet)):
+    pass
+
+
+def _chunks(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
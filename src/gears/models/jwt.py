@@ -1,17 +1,66 @@
 import os
 import json
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
 # import base64
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 # from cryptography.hazmat.backends import default_backend
 # from cryptography.hazmat.primitives import hashes
 # from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from ..settings import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PRIVATE_CLAIM = 'private'
+
+# the versions of the compact format, the plain JSON could not start with them
+COMPACT_JSON = b'\x01'
+COMPACT_ZLIB = b'\x02'
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TokenEncryption:
+    """
+    Symmetric encryption of the private token payload.
+
+    The JWT_PAYLOAD_ENCRYPTION_KEY setting is a key or a list of keys for the key
+    rotation, where the first one is the newest. The data is always encrypted with
+    the newest key, and it could be decrypted with any of them.
+    The cipher objects are built once per key (or list of keys) and reused.
+
+    By default, the data is the plain JSON, which any Fernet implementation decrypts.
+    If GEARS['jwt_private_compact'] is True, the data is stored in the compact format:
+    the compact JSON (made by orjson, if it's installed), compressed by zlib above
+    the size threshold, and marked with the version byte. The padding of the token is
+    dropped as well. `decrypt_data` detects the format, so both formats are decrypted.
+    """
+
+    _ciphers = {}
+    _ciphers_lock = threading.Lock()
+
     @staticmethod
     def generate_salt(length: int):
         return os.urandom(length)
@@ -33,19 +82,89 @@ class TokenEncryption:
     #     return base64.urlsafe_b64encode(kdf.derive(data))
 
     @staticmethod
-    def encrypt_data(data: dict, key: str = settings.JWT_PAYLOAD_ENCRYPTION_KEY):
-        fernet = Fernet(key)
-        data = json.dumps(data).encode()
-        return fernet.encrypt(data)
+    def get_key():
+        return settings.JWT_PAYLOAD_ENCRYPTION_KEY
+
+    @classmethod
+    def get_cipher(cls, key=None):
+        """
+        :param key: a key or a list of keys, the newest first
+        :return: a Fernet instance for a single key or a MultiFernet one for a list
+        """
+        key = key or cls.get_key()
+        keys = tuple(key) if isinstance(key, (list, tuple)) else (key,)
+        cipher = cls._ciphers.get(keys)
+        if cipher is None:
+            with cls._ciphers_lock:
+                cipher = cls._ciphers.get(keys)
+                if cipher is None:
+                    fernets = [Fernet(k) for k in keys]
+                    cipher = fernets[0] if len(fernets) == 1 else MultiFernet(fernets)
+                    cls._ciphers[keys] = cipher
+        return cipher
+
+    @classmethod
+    def encrypt_data(cls, data: dict, key=None):
+        conf = get_settings()
+        if not conf['jwt_private_compact']:
+            return cls.get_cipher(key).encrypt(json.dumps(data).encode())
+        data = cls.dump_data(data, conf['jwt_private_compression_threshold'])
+        return cls.get_cipher(key).encrypt(data).rstrip(b'=')
+
+    @classmethod
+    def decrypt_data(cls, encrypted: bytes, key=None):
+        data = cls.get_cipher(key).decrypt(cls._pad(encrypted))
+        return cls.load_data(data)
 
     @staticmethod
-    def decrypt_data(encrypted: bytes, key: str = settings.JWT_PAYLOAD_ENCRYPTION_KEY):
-        fernet = Fernet(key)
-        data = fernet.decrypt(encrypted)
-        return json.loads(data)
+    def dump_data(data, compression_threshold: int = None) -> bytes:
+        data = _json_dumps(data)
+        if compression_threshold is not None and len(data) > compression_threshold:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return COMPACT_ZLIB + compressed
+        return COMPACT_JSON + data
+
+    @staticmethod
+    def load_data(data: bytes):
+        version = data[:1]
+        if version == COMPACT_JSON:
+            return _json_loads(data[1:])
+        if version == COMPACT_ZLIB:
+            return _json_loads(zlib.decompress(data[1:]))
+        return json.loads(data)  # the plain JSON format
+
+    @classmethod
+    def rotate(cls, encrypted: bytes, key=None) -> bytes:
+        """
+        Re-encrypt the data with the newest key. It does nothing for a single key.
+        """
+        cipher = cls.get_cipher(key)
+        encrypted = cls._pad(encrypted)
+        if isinstance(cipher, MultiFernet):
+            encrypted = cipher.rotate(encrypted)
+        if get_settings()['jwt_private_compact']:
+            return encrypted.rstrip(b'=')
+        return encrypted
+
+    @staticmethod
+    def _pad(encrypted) -> bytes:
+        if isinstance(encrypted, str):
+            encrypted = encrypted.encode()
+        return encrypted + b'=' * (-len(encrypted) % 4)
 
 
 class JWTUserModelMixin:
+    """
+    jwt_payload_fields -- the fields the payload builders need. If provided, the
+    batch token issuance (`get_tokens_pairs`) loads these fields only.
+    jwt_payload_related -- the relations the payload builders need. They are loaded
+    by `select_related` for the batch token issuance.
+    """
+
+    jwt_payload_fields = ()
+    jwt_payload_related = ()
+
     def get_public_jwt_data(self) -> dict:
         """
         This method must return a payload dictionary. Fill this method with needed logic
@@ -81,6 +200,17 @@ class JWTUserModelMixin:
         :param token: a fresh valid RefreshToken
         :return: an extended RefreshToken
         """
+        token = self.extend_token_payload(token)
+        return _encrypt_private_claim(token)
+
+    def extend_token_payload(self, token):
+        """
+        The first step of `extend_token`: it fills in the token with the public data and
+        the private data, which is not encrypted yet. Override it instead of
+        `extend_token`, so the batch token issuance encrypts the private data in the pool.
+        :param token: a fresh valid RefreshToken
+        :return: an extended RefreshToken with the plain private data
+        """
 
         # Fill in the token with the public data
         public_data = self.get_public_jwt_data()
@@ -88,8 +218,7 @@ class JWTUserModelMixin:
             token[k] = v
 
         # Fill in the token with the private data
-        private_data = self.get_private_jwt_data()
-        token['private'] = TokenEncryption.encrypt_data(private_data).decode()
+        token[PRIVATE_CLAIM] = self.get_private_jwt_data()
         return token
 
     def build_token(self):
@@ -111,3 +240,115 @@ class JWTUserModelMixin:
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         }
+
+
+    @classmethod
+    def get_tokens_pairs(
+            cls, queryset=None, chunk_size: int = 500, workers: int = None,
+            executor_class=ThreadPoolExecutor,
+    ) -> Iterator[Tuple['JWTUserModelMixin', dict]]:
+        """
+        The batch version of get_tokens_pair. The users are loaded by chunks, the
+        payloads are built in the current thread, and the encryption and signing of
+        every chunk run in a pool of workers (threads or processes, use the
+        `executor_class`). The results are streamed in the order of the queryset.
+        :param queryset: the users queryset, all users by default
+        :param chunk_size: a number of users loaded and signed at once
+        :param workers: a number of workers, the current thread is used if not provided
+        :param executor_class: a concurrent.futures executor class
+        :return: an iterator of (user, tokens pair) tuples
+        """
+        queryset = cls.get_jwt_payload_queryset(queryset)
+        # the tokens of the overridden build_token or extend_token are encrypted already
+        encrypt = not cls._has_custom_token_builder()
+        chunks = cls._get_tokens_chunks(queryset, chunk_size, encrypt)
+        if not workers:
+            for users, tokens in chunks:
+                yield from zip(users, _sign_tokens_pairs(tokens, encrypt))
+            return
+        with executor_class(max_workers=workers) as executor:
+            pending = deque()
+            for users, tokens in chunks:
+                future = executor.submit(_sign_tokens_pairs, tokens, encrypt)
+                pending.append((users, future))
+                if len(pending) >= workers * 2:  # keep the memory bounded
+                    users, future = pending.popleft()
+                    yield from zip(users, future.result())
+            while pending:
+                users, future = pending.popleft()
+                yield from zip(users, future.result())
+
+    @classmethod
+    def get_jwt_payload_queryset(cls, queryset=None):
+        if queryset is None:
+            queryset = cls._default_manager.all()
+        if cls.jwt_payload_related:
+            queryset = queryset.select_related(*cls.jwt_payload_related)
+        if cls.jwt_payload_fields:
+            # the fields are used by RefreshToken.for_user
+            fields = [api_settings.USER_ID_FIELD, *cls.jwt_payload_fields]
+            if api_settings.CHECK_REVOKE_TOKEN:
+                fields.append('password')
+            if any(f.name == 'is_active' for f in cls._meta.concrete_fields):
+                fields.append('is_active')
+            queryset = queryset.only(*fields, *cls.jwt_payload_related)
+        return queryset
+
+    @classmethod
+    def _has_custom_token_builder(cls) -> bool:
+        return (
+            cls.build_token is not JWTUserModelMixin.build_token
+            or cls.extend_token is not JWTUserModelMixin.extend_token
+        )
+
+    @classmethod
+    def _get_tokens_chunks(cls, queryset, chunk_size: int, encrypt: bool):
+        # the overridden build_token or extend_token is used as it is (`encrypt` is
+        # False), otherwise the private data is encrypted by the pool
+        users, tokens = [], []
+        for user in queryset.iterator(chunk_size=chunk_size):
+            if not encrypt:
+                token = user.build_token()
+            else:
+                token = user.extend_token_payload(RefreshToken.for_user(user))
+            users.append(user)
+            tokens.append(token)
+            if len(users) >= chunk_size:
+                yield users, tokens
+                users, tokens = [], []
+        if users:
+            yield users, tokens
+
+
+def _encrypt_private_claim(token):
+    # any JSON value of the claim is encrypted, the callers encrypt it once
+    if PRIVATE_CLAIM in token.payload:
+        private_data = token.payload[PRIVATE_CLAIM]
+        token[PRIVATE_CLAIM] = TokenEncryption.encrypt_data(private_data).decode()
+    return token
+
+
+def _sign_tokens_pairs(tokens: List[RefreshToken], encrypt: bool = True) -> List[dict]:
+    # it runs in the pool workers, so keep it on the module level for pickling
+    pairs = []
+    for token in tokens:
+        if encrypt:
+            token = _encrypt_private_claim(token)
+        pairs.append({
+            'refresh': str(token),
+            'access': str(token.access_token),
+        })
+    return pairs
+
+
+class JWTRefreshToken(RefreshToken):
+    """
+    A RefreshToken which re-encrypts the private payload with the newest key,
+    so the refreshed tokens survive the JWT_PAYLOAD_ENCRYPTION_KEY rotation.
+    """
+
+    def __init__(self, token=None, verify=True):
+        super().__init__(token, verify)
+        if token is not None and PRIVATE_CLAIM in self.payload:
+            private = TokenEncryption.rotate(self.payload[PRIVATE_CLAIM])
+            self.payload[PRIVATE_CLAIM] = private.decode()
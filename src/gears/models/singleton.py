@@ -1,29 +1,80 @@
-from django.db import models
-from django.db.utils import ProgrammingError
+import copy
+import uuid
+
+from django.core.cache import caches
+from django.db import connections, models, router, transaction
+from django.db.utils import IntegrityError, ProgrammingError
 from django.forms import model_to_dict
 
 
 class SingletonModel(models.Model):
-    """Singleton Django Model"""
+    """
+    Singleton Django Model
+
+    singleton_pk -- a primary key of the object. New objects are always saved with it,
+    so the database rejects the second row and concurrent writes can't create
+    duplicates. The object is created on the first access by a single
+    `INSERT ... ON CONFLICT DO NOTHING` statement, if the database supports it.
+    use_cache -- if True, the object is cached in the process memory, so `get` and
+    `to_dict` don't hit the database on every call.
+    cache_alias -- a name of the Django cache backend (from the CACHES setting), where
+    the object is shared between processes. The object is stamped with a version, which
+    is changed on every save, so the other processes detect the stale copy by reading
+    the version key only. Without it, the process-local copy is invalidated within
+    the current process only.
+    cache_timeout -- a timeout of the shared cache entry of the object.
+    """
+
+    singleton_pk = 1
+    use_cache = False
+    cache_alias = None
+    cache_timeout = 60 * 60
 
     class Meta:
         abstract = True
 
     def save(self, *args, **kwargs):
-        self.__class__.objects.exclude(id=self.id).delete()
-        super(SingletonModel, self).save(*args, **kwargs)
+        if self._state.adding:
+            self._save_new(*args, **kwargs)
+        else:
+            super(SingletonModel, self).save(*args, **kwargs)  # a single UPDATE
+        self.__class__.invalidate_cache()
         return self
 
+    def _save_new(self, *args, **kwargs):
+        if self.pk is None:
+            self.pk = self.singleton_pk
+        using = kwargs.get('using') or router.db_for_write(
+            self.__class__, instance=self,
+        )
+        with transaction.atomic(using=using):
+            self.__class__.objects.using(using).exclude(pk=self.pk).delete()
+            try:
+                with transaction.atomic(using=using):
+                    super(SingletonModel, self).save(*args, **kwargs)
+            except IntegrityError:
+                # the object has been created concurrently, so overwrite it
+                self._state.adding = False
+                kwargs.update(force_insert=False, force_update=True)
+                super(SingletonModel, self).save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.__class__.invalidate_cache()
+        return result
+
     @classmethod
     def get(cls, attr: str = None):
-        try:
-            obj = cls.objects.get()
-        except cls.DoesNotExist:
-            obj = cls.objects.create()
-        except ProgrammingError as e:
+        if cls.use_cache:
+            obj = cls._get_cached_object()
+        else:
+            obj = cls._get_object()
+        if obj is None:
             return
         if attr:
             return getattr(obj, attr)
+        if cls.use_cache:
+            return copy.copy(obj)  # protect the cached object from changes
         return obj
 
     @classmethod
@@ -31,10 +82,164 @@ class SingletonModel(models.Model):
         obj = cls.get()
         for k, v in kwargs.items():
             setattr(obj, k, v)
-        obj.save()
+        # write the given fields only, so concurrent updates don't overwrite each other
+        update_fields = [*kwargs, *(
+            f.name for f in cls._meta.concrete_fields
+            if getattr(f, 'auto_now', False) and f.name not in kwargs
+        )]
+        obj.save(update_fields=update_fields)
         return obj
 
     @classmethod
     def to_dict(cls):
-        instance = cls.get()
-        return model_to_dict(instance)
+        if not cls.use_cache:
+            instance = cls.get()
+            return model_to_dict(instance)
+        instance = cls._get_cached_object()
+        cached = cls._get_local_cache(instance)
+        if cached is None:
+            return model_to_dict(instance)
+        if cached[2] is None:
+            cached[2] = model_to_dict(cached[1])
+        return copy.copy(cached[2])
+
+    @classmethod
+    def get_version(cls):
+        """
+        The shared version of the object, which is changed on every save. It's a cheap
+        way to check the object is changed (e.g. for the ETag). It requires the
+        `cache_alias`, so it's None without it.
+        """
+        cache = cls._get_cache() if cls.use_cache else None
+        if cache is None:
+            return
+        version = cache.get(cls._get_cache_key('version'))
+        if version is None:
+            version = cls._bump_version(cache)
+        return version
+
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Drop the process-local copy right now, and drop it again and change the shared
+        version when the current transaction is committed. Till then, the object is
+        read from the database inside the transaction and isn't cached, so neither
+        the uncommitted nor the stale values are cached.
+        """
+        if not cls.use_cache:
+            return
+        cls._local_cache = None
+        transaction.on_commit(
+            _CacheInvalidation(cls), using=router.db_for_write(cls),
+        )
+
+    @classmethod
+    def _get_object(cls):
+        try:
+            obj = cls.objects.get()
+        except cls.DoesNotExist:
+            obj = cls._create_object()
+        except ProgrammingError as e:
+            return
+        return obj
+
+    @classmethod
+    def _create_object(cls):
+        using = router.db_for_write(cls)
+        manager = cls.objects.db_manager(using)
+        if connections[using].features.supports_ignore_conflicts:
+            manager.bulk_create([cls(pk=cls.singleton_pk)], ignore_conflicts=True)
+            return manager.get()
+        try:
+            with transaction.atomic(using=using):
+                return manager.create(pk=cls.singleton_pk)
+        except IntegrityError:
+            return manager.get()  # it has been created concurrently
+
+    @classmethod
+    def _get_cached_object(cls):
+        if cls._has_pending_invalidation():
+            return cls._get_object()
+        cache = cls._get_cache()
+        local = cls.__dict__.get('_local_cache')
+        if cache is None:
+            if local is None:
+                local = cls._set_local_cache(None, cls._get_object())
+            return local[1]
+
+        version = cache.get(cls._get_cache_key('version'))
+        if local is not None and version is not None and local[0] == version:
+            return local[1]  # the process-local copy is actual
+
+        shared = cache.get(cls._get_cache_key('object')) if version else None
+        if shared is not None and shared[0] == version:
+            return cls._set_local_cache(*shared)[1]
+
+        obj = cls._get_object()
+        if obj is None:
+            return
+        if version is None:
+            version = cls._bump_version(cache)
+        cache.set(cls._get_cache_key('object'), (version, obj), cls.cache_timeout)
+        return cls._set_local_cache(version, obj)[1]
+
+    @classmethod
+    def _has_pending_invalidation(cls) -> bool:
+        # the object has been changed inside the current transaction
+        connection = transaction.get_connection(router.db_for_write(cls))
+        if not connection.in_atomic_block:
+            return False
+        return any(
+            isinstance(func, _CacheInvalidation) and func.model is cls
+            for sids, func, *_ in connection.run_on_commit
+        )
+
+    @classmethod
+    def _get_local_cache(cls, obj):
+        # to be sure the cache is filled, call it with the `_get_cached_object` result
+        local = cls.__dict__.get('_local_cache')
+        if local is None or local[1] is not obj:
+            return
+        return local
+
+    @classmethod
+    def _set_local_cache(cls, version, obj):
+        if obj is None:
+            return None, None, None
+        # version, object, dict representation of the object
+        cls._local_cache = [version, obj, None]
+        return cls._local_cache
+
+    @classmethod
+    def _bump_version(cls, cache) -> str:
+        version = uuid.uuid4().hex
+        cache.set(cls._get_cache_key('version'), version, None)
+        cache.delete(cls._get_cache_key('object'))
+        return version
+
+    @classmethod
+    def _get_cache(cls):
+        if cls.cache_alias is None:
+            return
+        return caches[cls.cache_alias]
+
+    @classmethod
+    def _get_cache_key(cls, name: str) -> str:
+        return f'gears:singleton:{cls._meta.label_lower}:{name}'
+
+
+class _CacheInvalidation:
+    """
+    The invalidation of the cached SingletonModel object, which is registered by
+    `transaction.on_commit`. Django drops it, if the transaction is rolled back.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self):
+        model = self.model
+        model._local_cache = None
+        cache = model._get_cache()
+        if cache is not None:
+            model._bump_version(cache)
@@ -0,0 +1,70 @@
+"""
+The fast JSON backends for APIRenderer. A backend is a callable, which takes the data
+and returns the compact UTF-8 JSON bytes, the same as DRF's JSONRenderer does.
+
+A backend raises TypeError or ValueError for the data it can't encode the same way,
+so the renderer falls back to the DRF encoder.
+"""
+import math
+from decimal import Decimal
+
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = JSONEncoder()
+
+if orjson is not None:
+    # the date and time types are passed to the DRF encoder, which formats them in
+    # its own way, as well as the types orjson doesn't know (e.g. Decimal)
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+_SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def has_non_finite_floats(data) -> bool:
+    """NaN or Infinity anywhere in the data (the Decimal ones are encoded as floats)."""
+    stack = [data]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        item = pop()
+        # the exact types first, it's run for every value of a large response
+        item_type = type(item)
+        if item_type in _SCALARS:
+            continue
+        if item_type is dict:
+            extend(item.values())
+        elif item_type is list or item_type is tuple:
+            extend(item)
+        elif isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            extend(item)
+        elif isinstance(item, Decimal) and not item.is_finite():
+            return True
+    return False
+
+
+def orjson_dumps(data) -> bytes:
+    ret = orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+    # orjson writes NaN and Infinity as null, the strict DRF encoder raises ValueError,
+    # so check the data, if there is any null in the output
+    if b'null' in ret and has_non_finite_floats(data):
+        raise ValueError('Out of range float values are not JSON compliant')
+    # the same escaping as JSONRenderer does for the javascript compatibility
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029',
+        )
+    return ret
@@ -0,0 +1,66 @@
+"""
+The binary renderers, which make the same envelope as APIRenderer. They need
+the optional packages: msgpack for MessagePackRenderer and cbor2 for CBORRenderer.
+
+    REST_FRAMEWORK = {
+        'DEFAULT_RENDERER_CLASSES': (
+            'gears.APIRenderer',
+            'gears.MessagePackRenderer',  # for `Accept: application/msgpack`
+        ),
+    }
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .renderer import APIEnvelopeMixin
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+_encoder = JSONEncoder()
+
+
+def _cbor_default(encoder, value):
+    encoder.encode(_encoder.default(value))
+
+
+class MessagePackRenderer(APIEnvelopeMixin, BaseRenderer):
+    """
+    The types unknown to MessagePack (e.g. Decimal, UUID, datetime) are encoded
+    the same way as the DRF JSON encoder does.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if msgpack is None:
+            raise ImproperlyConfigured('MessagePackRenderer requires msgpack installed')
+        return msgpack.packb(data, default=_encoder.default)
+
+
+class CBORRenderer(APIEnvelopeMixin, BaseRenderer):
+    """
+    Decimal, UUID, date and time are encoded with the standard CBOR tags. The rest of
+    the types unknown to CBOR are encoded the same way as the DRF JSON encoder does.
+    """
+
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+    render_style = 'binary'
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if cbor2 is None:
+            raise ImproperlyConfigured('CBORRenderer requires cbor2 installed')
+        return cbor2.dumps(data, default=_cbor_default)
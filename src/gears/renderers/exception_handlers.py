@@ -1,8 +1,6 @@
-from copy import copy
-
 from django.core.exceptions import PermissionDenied
 from django.http import Http404, HttpResponseNotFound
-from gears.renderers.mapping import RESPONSE_ERROR_MAPPING
+from gears.renderers.mapping import get_response_error_templates
 from gears.renderers.types import Error
 from rest_framework import exceptions
 from rest_framework import status
@@ -12,16 +10,26 @@ from rest_framework.views import set_rollback
 
 
 class ExceptionHandler(object):
+    """
+    location_as_path -- if True, the location of a nested error is a full path to the
+    field, e.g. `items.42.price`. Otherwise, it's the field name only.
+    max_errors -- a maximum number of the returned errors. The rest of them are
+    counted and replaced with a single `more_errors_code` error.
+    """
     default_code: str = 'unknown_error'
     default_description: str = 'Unknown error'
     default_status_code: str = status.HTTP_500_INTERNAL_SERVER_ERROR
     root_field_name: str = 'errors'
+    location_as_path: bool = True
+    max_errors: int = None
+    more_errors_code: str = 'more_errors'
 
     def __init__(self, exc, context):
         self.exc = exc
         self.context = context
         self.status_code = None
         self.errors: list = []
+        self.skipped_errors: int = 0
         self.data = {}
         self.headers = {}
 
@@ -52,16 +60,27 @@ class ExceptionHandler(object):
         self.exc = exc
 
     def process_list(self, detail: list, location):
-        for v in detail:
-            self.process(v, location=location)
+        # the nested errors are yielded to `process`, which walks them iteratively
+        for i, v in enumerate(detail):
+            if self.location_as_path and isinstance(v, (list, dict)):
+                # e.g. the errors of the `many=True` serializer items
+                yield v, self.get_location(location, i)
+            else:
+                yield v, location
 
     def process_dict(self, detail: dict, location):
         for k, v in detail.items():
-            self.process(v, location=k)
+            if self.location_as_path:
+                yield v, self.get_location(location, k)
+            else:
+                yield v, k
 
     def process_error(self, detail, location):
         if status.is_server_error(self.status_code):
             raise self.exc
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self.skipped_errors += 1
+            return
         self.errors.append(
             Error(
                 code=getattr(detail, 'code', self.default_code),
@@ -72,20 +91,48 @@ class ExceptionHandler(object):
         )
 
     def process(self, detail, location: str = None):
-        if isinstance(detail, list):
-            return self.process_list(detail, location)
-        if isinstance(detail, dict):
-            return self.process_dict(detail, location)
-        return self.process_error(detail, location)
+        stack = [iter(((detail, location),))]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            detail, location = item
+            if isinstance(detail, list):
+                stack.append(iter(self.process_list(detail, location) or ()))
+            elif isinstance(detail, dict):
+                stack.append(iter(self.process_dict(detail, location) or ()))
+            else:
+                self.process_error(detail, location)
+
+    def get_location(self, location, key) -> str:
+        if location is None:
+            return str(key)
+        return f'{location}.{key}'
 
     def response(self) -> list[dict]:
-        def _build(e: Error):
-            er = copy(RESPONSE_ERROR_MAPPING.get(e.code, e))
-            for k in ('code', 'location', 'description', 'detail',):
-                # set values from me or e
-                setattr(er, k, getattr(er, k) or getattr(e, k))
-            return er.__dict__
-        return [_build(err) for err in self.errors]
+        templates = get_response_error_templates()
+        errors = []
+        for e in self.errors:
+            template = templates.get(e.code)
+            if template is None:
+                errors.append(e.__dict__.copy())
+                continue
+            # take the mapped values, or the error ones if they are not set
+            code, location, description, detail = template
+            errors.append({
+                'code': code or e.code,
+                'location': location or e.location,
+                'description': description or e.description,
+                'detail': detail or e.detail,
+            })
+        if self.skipped_errors:
+            errors.append(Error(
+                code=self.more_errors_code,
+                description=f'{self.skipped_errors} more errors',
+                detail={'count': self.skipped_errors},
+            ).__dict__)
+        return errors
 
     def handle(self):
         self._super()
@@ -8,4 +8,34 @@ DEFAULT_MAPPING = dict(
     method_not_allowed=Error(location='http'),
 )
 
-RESPONSE_ERROR_MAPPING = getattr(settings, 'RESPONSE_ERROR_MAPPING', None) or DEFAULT_MAPPING
+
+_templates = None, {}
+
+
+def get_response_error_mapping() -> dict:
+    # the settings are read on call, not on import
+    return getattr(settings, 'RESPONSE_ERROR_MAPPING', None) or DEFAULT_MAPPING
+
+
+def get_response_error_templates() -> dict:
+    """
+    The error mapping compiled to the (code, location, description, detail) tuples,
+    which are merged with the errors. It's compiled once per mapping object.
+    """
+    global _templates
+    mapping = get_response_error_mapping()
+    compiled_mapping, templates = _templates
+    if compiled_mapping is not mapping:
+        templates = {
+            code: (e.code, e.location, e.description, e.detail)
+            for code, e in mapping.items()
+        }
+        _templates = mapping, templates
+    return templates
+
+
+def __getattr__(name: str):
+    # back consistency for `from gears.renderers.mapping import RESPONSE_ERROR_MAPPING`
+    if name == 'RESPONSE_ERROR_MAPPING':
+        return get_response_error_mapping()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
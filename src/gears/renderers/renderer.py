@@ -1,35 +1,64 @@
-from typing import Union
+import uuid
+from typing import Iterable, Iterator, Union
 
 from rest_framework.renderers import JSONRenderer
 
+from .backends import orjson, orjson_dumps
 from .types import Response
 
 
-class APIRenderer(JSONRenderer):
+class APIEnvelopeMixin:
+    """
+    The renderer mixin, which builds the API response envelope. The encoding is up to
+    the renderer, which has to implement the `encode` method. It's used by APIRenderer
+    and the binary renderers (see `gears.renderers.binary`).
+
+    pagination_result_field -- a key of the results list in the paginated data.
+    errors_field -- a key of the errors list in the error response data.
+    """
+
     pagination_result_field: str = 'results'
     errors_field: str = 'errors'
 
     def process(self, data, renderer_context):
+        return Response(**self._build_envelope(data, renderer_context))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        data = self.get_envelope(data, renderer_context)
+        ret = self.encode(data, accepted_media_type, renderer_context)
+        return ret
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        """
+        Encode the data as is, it's used for the built envelope.
+        """
+        raise NotImplementedError('Renderer class requires .encode() to be implemented')
+
+    def get_envelope(self, data, renderer_context) -> dict:
+        """
+        The same as `process(...).__dict__`, but without the dataclass building.
+        """
+        if type(self).process is not APIEnvelopeMixin.process:
+            return self.process(data, renderer_context).__dict__  # a custom one
+        return self._build_envelope(data, renderer_context)
+
+    def _build_envelope(self, data, renderer_context) -> dict:
         # request = renderer_context['request']
         response = renderer_context['response']
         success = not response.exception
         pagination = self.get_pagination(data)
-        return Response(
-            success=success,
-            status_code=response.status_code,
-            pagination=pagination,
-            errors=self.get_errors(success, data, renderer_context),
-            data=self.get_data(success, pagination, data, renderer_context),
-            service_data=self.get_service_data(
+        # the keys order is the `types.Response` fields one
+        return {
+            'success': success,
+            'status_code': response.status_code,
+            'pagination': pagination,
+            'errors': self.get_errors(success, data, renderer_context),
+            'data': self.get_data(success, pagination, data, renderer_context),
+            'service_data': self.get_service_data(
                 success, pagination, data, renderer_context,
             ),
-        )
-
-    def render(self, data, accepted_media_type=None, renderer_context=None):
-        data = self.process(data, renderer_context)
-        data = data.__dict__
-        ret = super().render(data, accepted_media_type, renderer_context)
-        return ret
+        }
 
     def get_errors(self, success: bool, data, renderer_context) -> list:
         if success:
@@ -38,13 +67,13 @@ class APIRenderer(JSONRenderer):
 
     def get_pagination(self, data) -> Union[dict, None]:
         try:
-            pagination_data = {
-                k: v for k, v in data.items() if k != self.pagination_result_field
-            }
+            count = data.get('count')
         except AttributeError:
-            pagination_data = {}
-        if pagination_data.get('count') is not None:
-            return pagination_data
+            return
+        if count is None:
+            return
+        # copy the data only when it's really paginated
+        return {k: v for k, v in data.items() if k != self.pagination_result_field}
 
     def get_data(
             self, success: bool, pagination, data, renderer_context,
@@ -61,3 +90,74 @@ class APIRenderer(JSONRenderer):
         if not success:
             return
         return renderer_context.get('service')
+
+
+class APIRenderer(APIEnvelopeMixin, JSONRenderer):
+    """
+    json_backend -- a fast JSON backend, a function which takes the envelope and
+    returns the compact UTF-8 JSON bytes (see `gears.renderers.backends`). If None,
+    the DRF encoder is used. The DRF encoder is used for the indented, ASCII-only or
+    non-compact output as well, and when the backend fails to encode the data
+    (raises TypeError or ValueError).
+    """
+
+    json_backend = None
+
+    def render_stream(
+            self, chunks: Iterable[list], accepted_media_type=None,
+            renderer_context=None,
+    ) -> Iterator[bytes]:
+        """
+        The streaming version of `render` for the successful list responses. The data
+        list is given by chunks, and every chunk is encoded once it's received.
+        :param chunks: an iterable of the data lists
+        :return: an iterator of the encoded envelope parts
+        """
+        renderer_context = renderer_context or {}
+        # encode the envelope with a marker instead of the data and split it there
+        marker = f'gears-stream-{uuid.uuid4().hex}'
+        envelope = self.get_envelope(marker, renderer_context)
+        head, tail = self.encode(envelope, accepted_media_type, renderer_context).split(
+            self.encode(marker, accepted_media_type, renderer_context), 1,
+        )
+        yield head + b'['
+        separator = b''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # it's an encoded list, so drop the brackets
+            yield separator + self.encode(
+                chunk, accepted_media_type, renderer_context,
+            ).strip()[1:-1]
+            separator = b','
+        yield b']' + tail
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if self.json_backend is not None and self._can_use_json_backend(
+            accepted_media_type, renderer_context or {},
+        ):
+            try:
+                # take it from the class, so a plain function isn't bound
+                return type(self).json_backend(data)
+            except (TypeError, ValueError):
+                pass  # e.g. a too big integer or NaN, let the DRF encoder handle it
+        return JSONRenderer.render(self, data, accepted_media_type, renderer_context)
+
+    def _can_use_json_backend(self, accepted_media_type, renderer_context) -> bool:
+        return (
+            self.compact
+            and self.strict
+            and not self.ensure_ascii
+            and not self.get_indent(accepted_media_type, renderer_context)
+        )
+
+
+class FastAPIRenderer(APIRenderer):
+    """
+    The high-throughput APIRenderer, which encodes the envelope by orjson, if it's
+    installed. The output is the same, except the floats in the exponent notation
+    (orjson writes `1e16` instead of `1e+16`). The data with NaN or Infinity is passed
+    to the DRF encoder, which raises ValueError in the strict mode.
+    """
+
+    json_backend = orjson_dumps if orjson is not None else None
@@ -1,4 +1,9 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+
+from ..models.jwt import JWTRefreshToken
 
 
 class JWTObtainPairSerializer(TokenObtainPairSerializer):
@@ -13,3 +18,12 @@ class JWTObtainPairSerializer(TokenObtainPairSerializer):
                 'JWTObtainPairSerializer must be used with a JWTUserModelMixin together'
             )
         return user.build_token()
+
+
+class JWTRefreshSerializer(TokenRefreshSerializer):
+    """
+    This is a helper serializer, which re-encrypts the private payload of the
+    refreshed tokens with the newest JWT_PAYLOAD_ENCRYPTION_KEY.
+    """
+
+    token_class = JWTRefreshToken
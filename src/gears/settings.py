@@ -1,15 +1,38 @@
+from functools import lru_cache
+from types import MappingProxyType
+
 from django.conf import settings
+from django.core.signals import setting_changed
 
 
+@lru_cache(maxsize=None)
 def get_settings():
+    # the cached settings are shared by all callers, so they are read-only
     default = dict(
         run_gears_server_up_tasks=[],
         run_gears_server_down_tasks=[],
+        # the compact format of the encrypted private JWT payload, it's decrypted by
+        # TokenEncryption only, so keep the plain JSON format for other consumers
+        jwt_private_compact=False,
+        # compress the compact private JWT payload which is larger (bytes)
+        jwt_private_compression_threshold=256,
+        # the memoization of the decrypted private JWT payload by JWTAuthentication
+        jwt_private_cache_size=1024,
+        jwt_private_cache_ttl=300,
     )
 
     conf = getattr(settings, "GEARS", {})
 
-    return {
+    return MappingProxyType({
         attr_name: conf.get(attr_name, default_value)
         for attr_name, default_value in default.items()
-    }
+    })
+
+
+def reload_settings(*args, setting=None, **kwargs):
+    # the settings are cached, so reload them if they are changed (e.g. in tests)
+    if setting == "GEARS":
+        get_settings.cache_clear()
+
+
+setting_changed.connect(reload_settings)
@@ -1,6 +1,6 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from ..serializers.jwt import JWTObtainPairSerializer
+from ..serializers.jwt import JWTObtainPairSerializer, JWTRefreshSerializer
 
 
 class JWTObtainPairView(TokenObtainPairView):
@@ -10,3 +10,12 @@ class JWTObtainPairView(TokenObtainPairView):
     """
 
     serializer_class = JWTObtainPairSerializer
+
+
+class JWTRefreshView(TokenRefreshView):
+    """
+    This is a helper view for refreshing the tokens issued by JWTObtainPairView.
+    It keeps the private payload readable after the encryption key rotation.
+    """
+
+    serializer_class = JWTRefreshSerializer
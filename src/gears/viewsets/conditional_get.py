@@ -0,0 +1,94 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from ..exceptions.views import EarlyResponse
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class ConditionalGetMixin:
+    """
+    ConditionalGetMixin sets the strong ETag for the successful GET responses and answers
+    the `If-None-Match` requests with `304 Not Modified` and an empty body.
+
+    By default, the ETag is a hash of the rendered response, so it saves the traffic
+    only. Provide a cheap version of the data for the action to skip the serialization
+    at all. The version is checked after the authentication and permissions.
+
+    Version hooks
+    Use `get_{action}_etag_version` methods, e.g. `get_list_etag_version`, or override
+    `get_etag_version` for every action. The version must be changed with the data,
+    e.g. the last `updated_at` of the queryset (see `get_queryset_version`) or
+    `SingletonModel.get_version()`. The ETag of the version covers the path with
+    the query, the accepted media type and the user as well.
+
+    content_etag -- if True, the ETag is computed over the rendered response, when
+    the action has no version.
+    """
+    content_etag = True
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._etag = None
+        if request.method not in SAFE_METHODS:
+            return
+        version = self.get_etag_version()
+        if version is None:
+            return
+        self._etag = self.make_etag(
+            self.action,
+            version,
+            request.get_full_path(),
+            request.accepted_media_type,
+            getattr(request.user, 'pk', None),
+        )
+        response = get_conditional_response(request._request, etag=self._etag)
+        if response is not None:
+            response['ETag'] = self._etag
+            raise EarlyResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in SAFE_METHODS or response.status_code != 200:
+            return response
+        etag = getattr(self, '_etag', None)
+        if etag is None:
+            if not self.content_etag or response.streaming:
+                return response
+            if isinstance(response, Response):
+                response.render()  # it's rendered once, so the handler skips it
+            etag = self.make_etag(response.get('Content-Type'), response.content)
+        response['ETag'] = etag
+        return get_conditional_response(request._request, etag=etag, response=response)
+
+    def get_etag_version(self):
+        method = getattr(self, f'get_{self.action}_etag_version', None)
+        if method:
+            return method()
+
+    def get_queryset_version(self, field: str = 'updated_at') -> str:
+        """
+        A version of the action queryset made by a single aggregation query: the last
+        value of the field and the number of objects, so the deletion changes it too.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        result = queryset.order_by().aggregate(last=Max(field), count=Count('pk'))
+        return f"{result['count']}:{result['last']}"
+
+    @staticmethod
+    def make_etag(*parts) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = str(part).encode()
+            digest.update(len(part).to_bytes(8, 'little'))  # keep the parts apart
+            digest.update(part)
+        return f'"{digest.hexdigest()}"'
@@ -1,23 +1,112 @@
+from types import MappingProxyType
+
+from rest_framework import exceptions
+
+_shared_permissions = {}  # a tuple of classes: a tuple of the shared instances
+
+
 class PermissionsMixin:
     """
-    PermissionsMixin ...
+    PermissionsMixin maps the permission classes to the ViewSet actions.
+
+        permissions = {
+            'default': [IsAuthenticated],  # for the actions, which are not listed
+            'list': [AllowAny],
+            'destroy': [IsAdminUser],
+        }
+
+    The permission classes of every action are resolved once per ViewSet class
+    (see `get_permissions_table`).
+
+    Queryset filtering
+    A permission class could define `filter_queryset(request, queryset, view)`, the same
+    as a filter backend has. It's applied by `filter_queryset` of the ViewSet, so the list
+    actions check the permissions by SQL instead of every object.
+
+    permission_classes_as_global -- use permission_classes globally if True.
+    default_name -- a key of the default permission classes.
+    reuse_permission_instances -- if True, the permission instances are created once
+    and shared between the requests. The permission classes must be stateless.
+    memoize_object_permissions -- if True, the object permissions are checked once per
+    object (model and pk) within the request.
     """
     permission_classes = []
     permission_classes_as_global = True  # use permission_classes globally if True
     default_name = 'default'
     permissions = {}
+    reuse_permission_instances = False
+    memoize_object_permissions = False
+    _permissions_table = None, None, ()  # the owner class, its table and the default
+
+    @classmethod
+    def get_permissions_table(cls) -> MappingProxyType:
+        """
+        Resolve the permission classes of the actions once and cache them on the class.
+        The actions without the permission classes are resolved to the default ones.
+        The global permission classes are not in the table, they are taken from the
+        view on every request, since `@action(permission_classes=...)` sets them on
+        the instance.
+        """
+        owner, table, default = cls._permissions_table
+        if owner is not cls:
+            table, default = cls._build_permissions_table(cls.permissions)
+            cls._permissions_table = cls, table, default
+        return MappingProxyType(table)
 
     def get_permission_classes(self):
         global_classes = []
         if self.permission_classes_as_global:
             global_classes.extend(self.permission_classes)
 
-        classes = self.permissions.get(self.action) \
-                        or self.permissions.get(self.default_name)
-        if classes:
-            global_classes.extend(classes)
-
+        if 'permissions' in self.__dict__:  # set by `@action(permissions=...)`
+            table, default = self._build_permissions_table(self.permissions)
+        else:
+            owner, table, default = self._permissions_table
+            if owner is not type(self):
+                self.get_permissions_table()
+                owner, table, default = self._permissions_table
+        global_classes.extend(table.get(self.action, default))
         return global_classes
 
+    @classmethod
+    def _build_permissions_table(cls, permissions: dict):
+        default = tuple(permissions.get(cls.default_name) or ())
+        table = {
+            action: tuple(classes) for action, classes in permissions.items() if classes
+        }
+        return table, default
+
     def get_permissions(self):
-        return [permission() for permission in self.get_permission_classes()]
+        classes = self.get_permission_classes()
+        if not self.reuse_permission_instances:
+            return [permission() for permission in classes]
+        classes = tuple(classes)
+        permissions = _shared_permissions.get(classes)
+        if permissions is None:
+            permissions = tuple(permission() for permission in classes)
+            _shared_permissions[classes] = permissions
+        return list(permissions)
+
+    def check_object_permissions(self, request, obj):
+        if not self.memoize_object_permissions:
+            return super().check_object_permissions(request, obj)
+        memo = self.__dict__.setdefault('_object_permissions_memo', {})
+        pk = getattr(obj, 'pk', None)
+        key = (type(obj), pk) if pk is not None else (type(obj), id(obj))
+        if key in memo:
+            if memo[key] is not None:
+                raise memo[key]
+            return
+        try:
+            super().check_object_permissions(request, obj)
+        except (exceptions.PermissionDenied, exceptions.NotAuthenticated) as e:
+            memo[key] = e
+            raise
+        memo[key] = None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        for permission in self.get_permissions():
+            if hasattr(permission, 'filter_queryset'):
+                queryset = permission.filter_queryset(self.request, queryset, self)
+        return queryset
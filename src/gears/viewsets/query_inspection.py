@@ -0,0 +1,230 @@
+import contextlib
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.response import Response
+
+from ..exceptions.views import QueryInspectionError
+
+logger = logging.getLogger('gears.queries')
+
+# the reports of the views and the strict flag, set by `inspect_view_queries`
+_inspection = ContextVar('gears_query_inspection', default=None)
+
+_placeholders = re.compile(r'%s(?:\s*,\s*%s)+')
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def get_query_template(sql: str) -> str:
+    """
+    The SQL without the values, so the queries, which differ in the params only,
+    have the same template. The lists of the params (`IN (%s, %s)`) are collapsed.
+    """
+    sql = _literals.sub('%s', sql)
+    return _placeholders.sub('%s, ...', sql)
+
+
+class QueryReport:
+    """
+    The queries of a single request by phases: `get_queryset`, `pagination`,
+    `pagination_summary`, `serialization`, `service_data` and `other` for the rest
+    of the view code. The phases are nested, a query belongs to the innermost one.
+    """
+
+    def __init__(self, view: str, action: str):
+        self.view = view
+        self.action = action
+        self.total = 0
+        self.time = 0.0
+        self.phases = Counter()
+        self.queries = Counter()  # (phase, sql): count
+        self.phase = 'other'
+
+    def add(self, sql: str, duration: float):
+        self.total += 1
+        self.time += duration
+        self.phases[self.phase] += 1
+        self.queries[(self.phase, sql)] += 1  # the template is made by the report
+
+    @property
+    def templates(self) -> Counter:
+        templates = Counter()  # (phase, template): count
+        for (phase, sql), count in self.queries.items():
+            templates[(phase, get_query_template(sql))] += count
+        return templates
+
+    def get_repeated(self, threshold: int) -> list:
+        """The templates, which are repeated `threshold` times at least (the N+1 ones)."""
+        if self.total < threshold:
+            return []
+        return [
+            {'phase': phase, 'sql': template, 'count': count}
+            for (phase, template), count in self.templates.most_common()
+            if count >= threshold
+        ]
+
+    def as_dict(self, threshold: int) -> dict:
+        return {
+            'total': self.total,
+            'time': round(self.time * 1000, 3),  # ms
+            'phases': dict(self.phases),
+            'repeated': self.get_repeated(threshold),
+        }
+
+
+class QueryInspectionMixin:
+    """
+    QueryInspectionMixin records the DB queries of the request by phases (see
+    `QueryReport`), and checks the query budget of the action and the repeated
+    query templates, which are the N+1 queries usually. The problems are logged
+    by the `gears.queries` logger, or `QueryInspectionError` is raised in the strict
+    mode. Use `inspect_view_queries` in the tests, it turns on the strict mode.
+
+        query_budgets = {
+            'list': 5,
+            'retrieve': 3,
+        }
+
+    The queries of the streaming responses, which are made after the view returns,
+    are not recorded.
+
+    inspect_queries -- if True, the queries are recorded. If False, it's a single check.
+    query_budget -- the max number of the queries of the actions without the budget,
+    None for no limit.
+    query_budgets -- the max number of the queries by the actions.
+    query_repeat_threshold -- the number of the same queries in a phase, which is
+    reported as the N+1 one, None to skip the check.
+    query_inspection_strict -- if True, QueryInspectionError is raised instead of
+    logging.
+    query_report_in_service_data -- if True, the report is added to the service data
+    of the response as `queries` in the DEBUG mode.
+    """
+    inspect_queries = False
+    query_budget = None
+    query_budgets = {}
+    query_repeat_threshold = 5
+    query_inspection_strict = False
+    query_report_in_service_data = True
+
+    def dispatch(self, request, *args, **kwargs):
+        inspection = _inspection.get()
+        if not self.inspect_queries and inspection is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        view = f'{type(self).__module__}.{type(self).__qualname__}'
+        report = self.query_report = QueryReport(view, getattr(self, 'action', None))
+        self._wrap_query_phases(report)
+
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                report.add(sql, time.perf_counter() - start)
+
+        with contextlib.ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(record))
+            response = super().dispatch(request, *args, **kwargs)
+
+        report.action = self.action  # it's set by `initialize_request`
+        strict = self.query_inspection_strict
+        if inspection is not None:
+            inspection['reports'].append(report)
+            strict = strict or inspection['strict']
+        if self.query_report_in_service_data and settings.DEBUG:
+            self.add_query_report(response, report)
+        self.check_query_report(report, strict)
+        return response
+
+    def get_query_budget(self) -> Optional[int]:
+        return self.query_budgets.get(self.action, self.query_budget)
+
+    def check_query_report(self, report: QueryReport, strict: bool):
+        problems = []
+        budget = self.get_query_budget()
+        if budget is not None and report.total > budget:
+            problems.append(
+                f'{report.total} queries, the budget of `{report.action}` is {budget}'
+            )
+        if self.query_repeat_threshold:
+            for repeated in report.get_repeated(self.query_repeat_threshold):
+                problems.append(
+                    f"{repeated['count']} same queries in `{repeated['phase']}`: "
+                    f"{repeated['sql']}"
+                )
+        if not problems:
+            return
+        message = f'{report.view} ({report.action}): ' + '; '.join(problems)
+        if strict:
+            raise QueryInspectionError(message, report)
+        logger.warning(message)
+
+    def add_query_report(self, response, report: QueryReport):
+        context = getattr(response, 'renderer_context', None)
+        if not isinstance(response, Response) or context is None:
+            return
+        service = context.get('service')
+        if service is None:
+            service = {}
+        if isinstance(service, dict):
+            context['service'] = {
+                **service, 'queries': report.as_dict(self.query_repeat_threshold or 2),
+            }
+
+    def _wrap_query_phases(self, report: QueryReport):
+        # the instance attributes, so the class methods are not changed
+        def in_phase(phase, method):
+            def wrapper(*args, **kwargs):
+                outer, report.phase = report.phase, phase
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    report.phase = outer
+            return wrapper
+
+        for phase, name in (
+                ('get_queryset', 'get_queryset'),
+                ('pagination', 'paginate_queryset'),
+                ('pagination_summary', 'get_pagination_summary'),
+                ('service_data', 'get_service_data'),
+        ):
+            method = getattr(self, name, None)
+            if method is not None:
+                setattr(self, name, in_phase(phase, method))
+
+        get_serializer = self.get_serializer
+
+        def get_serializer_in_phase(*args, **kwargs):
+            serializer = get_serializer(*args, **kwargs)
+            serializer.to_representation = in_phase(
+                'serialization', serializer.to_representation,
+            )
+            return serializer
+
+        self.get_serializer = get_serializer_in_phase
+
+
+@contextlib.contextmanager
+def inspect_view_queries(strict: bool = True):
+    """
+    Inspect the queries of the QueryInspectionMixin views in the block, even if
+    `inspect_queries` is False, and collect their reports. The problems raise
+    QueryInspectionError, unless `strict` is False.
+
+        with inspect_view_queries() as reports:
+            client.get('/api/books/')
+        assert reports[0].phases['serialization'] == 0
+    """
+    inspection = {'reports': [], 'strict': strict}
+    token = _inspection.set(inspection)
+    try:
+        yield inspection['reports']
+    finally:
+        _inspection.reset(token)
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+@dataclass(frozen=True)
+class QuerysetPlan:
+    """
+    The related objects and the columns, which a serializer reads.
+
+    select_related -- the paths joined by the single query.
+    prefetch_related -- the paths loaded by the additional queries.
+    only -- the loaded columns (the paths of the joined models), None for all of them.
+    """
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+    only: Optional[Tuple[str, ...]] = None
+
+    def apply(self, queryset, projection: bool = True):
+        """
+        Apply the plan on the top of the queryset, and keep what it already has:
+        the explicit prefetches, `select_related()` of all relations and the deferred
+        columns are not changed.
+        """
+        if queryset._fields is not None:  # values() or values_list()
+            return queryset
+        if self.select_related and queryset.query.select_related is not True:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            existing = {
+                getattr(lookup, 'prefetch_to', lookup)
+                for lookup in queryset._prefetch_related_lookups
+            }
+            lookups = [
+                lookup for lookup in self.prefetch_related if lookup not in existing
+            ]
+            if lookups:
+                queryset = queryset.prefetch_related(*lookups)
+        if (
+                projection
+                and self.only is not None
+                and queryset.query.deferred_loading == (frozenset(), True)
+        ):
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def _join(path: str, name: str) -> str:
+    return f'{path}__{name}' if path else name
+
+
+def _get_model_field(model, name: str):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        for relation in model._meta.related_objects:  # e.g. `book_set`
+            if relation.get_accessor_name() == name:
+                return relation
+        raise
+
+
+def _get_nested_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+
+
+class _Planner:
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.only = set()
+        self.joined = {}  # a path of the joined model: the model
+        self.whole = set()  # the paths of the joined models, which are read entirely
+
+    def plan(self, serializer, model) -> QuerysetPlan:
+        self.joined[''] = model
+        self.walk(serializer, model, '', True)
+        for path in self.whole:
+            for field in self.joined[path]._meta.concrete_fields:
+                self.only.add(_join(path, field.name))
+        return QuerysetPlan(
+            select_related=tuple(sorted(self.select_related)),
+            prefetch_related=tuple(sorted(self.prefetch_related)),
+            only=tuple(sorted(self.only)) or None,
+        )
+
+    def read_whole(self, path: str, joined: bool):
+        if joined:
+            self.whole.add(path)
+
+    def walk(self, serializer, model, path: str, joined: bool):
+        # `joined` is False beyond a prefetched relation, its columns are not projected
+        for field in serializer.fields.values():
+            if not field.write_only:
+                self.walk_field(field, model, path, joined)
+
+    def walk_field(self, field, model, path: str, joined: bool):
+        nested = _get_nested_serializer(field)
+        if field.source == '*':
+            if nested is not None:
+                self.walk(nested, model, path, joined)
+            else:
+                self.read_whole(path, joined)  # e.g. SerializerMethodField
+            return
+
+        attrs = field.source_attrs
+        for i, attr in enumerate(attrs):
+            try:
+                model_field = _get_model_field(model, attr)
+            except FieldDoesNotExist:
+                self.read_whole(path, joined)  # a property or a method
+                return
+            if not model_field.is_relation:
+                if joined:
+                    self.only.add(_join(path, attr))
+                return
+            if model_field.related_model is None:  # GenericForeignKey
+                self.read_whole(path, joined)
+                self.prefetch_related.add(_join(path, attr))
+                return
+
+            related_path = _join(path, attr)
+            if model_field.many_to_many or model_field.one_to_many:
+                self.prefetch_related.add(related_path)
+                joined = False
+            else:
+                if joined and model_field.concrete:
+                    self.only.add(related_path)  # the column of the foreign key
+                last = i == len(attrs) - 1
+                if (
+                        last
+                        and isinstance(field, serializers.RelatedField)
+                        and field.use_pk_only_optimization()
+                ):
+                    return  # the primary key is taken from the column
+                if joined:
+                    self.select_related.add(related_path)
+                    self.joined[related_path] = model_field.related_model
+                else:
+                    self.prefetch_related.add(related_path)
+            model, path = model_field.related_model, related_path
+
+        if nested is not None:
+            self.walk(nested, model, path, joined)
+        elif not isinstance(field, serializers.ManyRelatedField):
+            self.read_whole(path, joined)  # e.g. StringRelatedField
+
+
+def build_queryset_plan(serializer, model) -> QuerysetPlan:
+    """
+    Build the plan of the queryset of the model by the fields of the serializer.
+    The nested serializers and the dotted sources of the forward foreign keys and
+    one-to-one relations are joined, the many relations are prefetched. The properties,
+    the methods and the `SerializerMethodField` read their objects entirely, since
+    it's unknown, which columns they use.
+    """
+    return _Planner().plan(serializer, model)
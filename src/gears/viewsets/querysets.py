@@ -1,3 +1,8 @@
+from .query_plan import QuerysetPlan, build_queryset_plan
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
 class ConditionalQuerysetMixin:
     """
     ConditionalQuerysetMixin gives you an ability to have multiple `get_queryset`
@@ -14,8 +19,22 @@ class ConditionalQuerysetMixin:
     If ConditionalQuerysetMixin can't find a mapped or named queryset, it will try to
     find a method with a ViewSet action instead of name.
     E.g: `get_list_queryset`, `get_update_queryset`, get_custom_action_queryset.
+
+    Automatic queryset plan
+    If `auto_queryset_plan` is True, the queryset of the action gets `select_related`,
+    `prefetch_related` and `only` by the fields of the action serializer (see
+    `build_queryset_plan`). It's applied on the top of the mapped or named queryset,
+    and the plan is built once per ViewSet class, action and serializer class, so
+    the serializers with the fields, which depend on the request, are not supported.
+
+    auto_queryset_plan -- if True, the queryset plan is applied.
+    auto_queryset_only -- if True, only the read columns are loaded (GET requests).
+    Disable it, if the permissions or the action code read the other columns.
     """
     querysets = {}
+    auto_queryset_plan = False
+    auto_queryset_only = True
+    _queryset_plans = None, None  # the owner class and its plans
 
     def get_queryset(self, **kwargs):
         queryset = super().get_queryset()
@@ -25,7 +44,30 @@ class ConditionalQuerysetMixin:
         method = self.try_method(f"get_{name}_queryset")
         if method:
             queryset = method(queryset)
+        if self.auto_queryset_plan and name == self.action:
+            request = getattr(self, 'request', None)
+            projection = (
+                self.auto_queryset_only
+                and request is not None
+                and request.method in SAFE_METHODS
+            )
+            queryset = self.get_queryset_plan(queryset.model).apply(
+                queryset, projection=projection,
+            )
         return queryset
 
+    def get_queryset_plan(self, model) -> QuerysetPlan:
+        serializer_class = self.get_serializer_class()
+        owner, plans = self._queryset_plans
+        if owner is not type(self):
+            plans = {}
+            type(self)._queryset_plans = type(self), plans
+        key = (self.action, serializer_class, model)
+        plan = plans.get(key)
+        if plan is None:
+            plan = build_queryset_plan(self.get_serializer(), model)
+            plans[key] = plan
+        return plan
+
     def try_method(self, method_name: str):
         return getattr(self, method_name, None)
@@ -0,0 +1,190 @@
+import hashlib
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from ..exceptions.views import EarlyResponse
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+_watched = {}  # model: a set of the cache aliases, which keep its version
+_watched_lock = threading.Lock()
+
+
+def _get_version_key(model) -> str:
+    return f'gears:response:version:{model._meta.label_lower}'
+
+
+def invalidate_cached_responses(*models, using: str = None):
+    """
+    Change the versions of the models, so the cached responses, which depend on them,
+    are not used anymore. It's done when the current transaction is committed.
+    The saving and deleting of the objects call it automatically, but the bulk
+    operations (e.g. `update` or `bulk_create`) don't, so call it by yourself.
+    """
+    for model in models:
+        model = model._meta.concrete_model
+        for alias in _watched.get(model, ()):
+            transaction.on_commit(
+                lambda key=_get_version_key(model), alias=alias: caches[alias].set(
+                    key, uuid.uuid4().hex, None,
+                ),
+                using=using,
+            )
+
+
+def _on_model_write(sender, using=None, **kwargs):
+    # the signals are sent with the proxy models as well, so match the concrete one
+    if sender._meta.concrete_model in _watched:
+        invalidate_cached_responses(sender, using=using)
+
+
+def _watch(model, alias: str):
+    model = model._meta.concrete_model
+    if alias in _watched.get(model, ()):
+        return
+    with _watched_lock:
+        if not _watched:
+            uid = 'gears-response-cache'
+            post_save.connect(_on_model_write, dispatch_uid=uid)
+            post_delete.connect(_on_model_write, dispatch_uid=uid)
+        _watched[model] = {*_watched.get(model, ()), alias}
+
+
+class CachedResponseMixin:
+    """
+    CachedResponseMixin caches the rendered successful GET responses of the actions.
+    The cached response is returned after the authentication and permissions, so
+    the queryset, the serializer and the renderer are not run at all.
+
+    The key covers the action, the serializer class, the path, the query params
+    (in any order), the accepted media type and the user, since the queryset or the
+    serializer could depend on it. Add the request headers by `cache_vary_on_headers`.
+
+    Invalidation
+    `cache_models` are the models the responses depend on. Every model has a version,
+    which is a part of the key, and it's changed when an object (of the model or of its
+    proxy models) is saved or deleted (after the commit). The signals are connected
+    when the ViewSet class is defined, so the processes, which change the models
+    (e.g. the workers), have to import it. Call `invalidate_cached_responses(Model)`
+    after the bulk operations, they don't send the signals.
+
+    Only a single request computes a missing response, the concurrent ones wait for
+    it `cache_lock_timeout` seconds at most, and then compute it by themselves.
+
+    cache_actions -- the cached actions.
+    cache_alias -- a name of the Django cache backend (from the CACHES setting).
+    cache_timeout -- a timeout of the cached response.
+    cache_max_size -- the larger responses (bytes) are not cached, None for no limit.
+    cache_models -- the models, which changes invalidate the cached responses.
+    cache_vary_on_user -- if True, the responses are cached for every authenticated
+    user. Set it False, if the responses are the same for all the users.
+    cache_vary_on_headers -- the request headers, which change the response.
+    cache_lock_timeout -- how long the concurrent requests wait for the response.
+    """
+    cache_actions = ('list', 'retrieve')
+    cache_alias = 'default'
+    cache_timeout = 60
+    cache_max_size = 1024 * 1024
+    cache_models = ()
+    cache_vary_on_user = True
+    cache_vary_on_headers = ()
+    cache_lock_timeout = 10
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.cache_models:
+            _watch(model, cls.cache_alias)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._response_cache_key = None
+        self._response_cache_lock = None
+        if request.method not in SAFE_METHODS or self.action not in self.cache_actions:
+            return
+        cache = caches[self.cache_alias]
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            lock = f'{key}:lock'
+            if cache.add(lock, 1, self.cache_lock_timeout):
+                self._response_cache_lock = lock  # compute it and release the lock
+            else:
+                cached = self._wait_cached_response(cache, key)
+        if cached is not None:
+            raise EarlyResponse(self.build_cached_response(cached))
+        self._response_cache_key = key
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key is None:
+            return response
+        cache = caches[self.cache_alias]
+        try:
+            if response.status_code == 200 and not response.streaming:
+                if isinstance(response, Response):
+                    response.render()  # it's rendered once, so the handler skips it
+                content = response.content
+                if self.cache_max_size is None or len(content) <= self.cache_max_size:
+                    cached = (content, response.get('Content-Type'))
+                    cache.set(key, cached, self.cache_timeout)
+        finally:
+            if self._response_cache_lock:
+                cache.delete(self._response_cache_lock)
+        return response
+
+    def get_response_cache_key(self, request) -> str:
+        cache = caches[self.cache_alias]
+        version_keys = []
+        for model in self.cache_models:
+            version_keys.append(_get_version_key(model._meta.concrete_model))
+        versions = cache.get_many(version_keys)
+        for version_key in version_keys:
+            if version_key not in versions:
+                # a fresh version, so the entries of the lost one are not used
+                cache.add(version_key, uuid.uuid4().hex, None)
+                versions[version_key] = cache.get(version_key)
+
+        serializer_class = self.get_serializer_class()
+        parts = [
+            serializer_class.__module__,
+            serializer_class.__qualname__,
+            request.path,
+            sorted(request.query_params.lists()),
+            request.accepted_media_type,
+            [versions[k] for k in version_keys],
+        ]
+        if self.cache_vary_on_user:
+            # the anonymous users share the responses
+            parts.append(getattr(request.user, 'pk', None))
+        for header in self.cache_vary_on_headers:
+            parts.append(request.headers.get(header))
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        view = f'{type(self).__module__}.{type(self).__qualname__}'
+        return f'gears:response:{view}:{self.action}:{digest}'
+
+    def build_cached_response(self, cached):
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def _wait_cached_response(self, cache, key):
+        deadline = time.monotonic() + self.cache_lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            if cache.get(f'{key}:lock') is None:
+                return  # the computing request has failed
@@ -1,4 +1,5 @@
 import warnings
+from types import MappingProxyType
 
 
 class SerializersMixin(object):
@@ -30,19 +31,33 @@ class SerializersMixin(object):
         }
 
     Priority: specified by name, action, method, default
+
+    The serializers are resolved once per ViewSet class into an immutable table
+    (see `get_serializers_table`), so getting the serializer for the action is
+    a single lookup.
     """
     serializers = {}
     default_serializer_name = None  # None as a key for dict
-    _serializers = {}
+    _serializers_table = None, None  # the owner class and its table
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        if hasattr(self, "serializer_class"):
-            self._serializers[self.default_serializer_name] = self.serializer_class
+        self.get_serializers_table()  # it's validated once per class
+
+    @classmethod
+    def get_serializers_table(cls) -> MappingProxyType:
+        """
+        Resolve the serializers of the actions once and cache them on the class:
+        the named and action serializers, the `read_only` and `write_only` groups
+        and the default one (the `None` key is for it).
+        """
+        owner, table = cls._serializers_table
+        if owner is cls:
+            return MappingProxyType(table)
 
         # Back consistency warning
         _d = "default"
-        if _d in self.serializers.keys() and self.default_serializer_name != _d:
+        if _d in cls.serializers.keys() and cls.default_serializer_name != _d:
             warnings.warn(
                 "Since version 0.10.1 the name of default serializer is `None`. "
                 "You have to rename it if you still use the `default` key. "
@@ -51,23 +66,39 @@ class SerializersMixin(object):
                 "Notice that it was renamed: default_name -> default_serializer_name."
             )
 
-        self._serializers.update(self.serializers)
-
-        if self.default_serializer_name not in self.serializers:
+        default = (
+            cls.serializers.get(cls.default_serializer_name)
+            or cls.serializers.get(_d)  # "default" is for the back consistency
+            or getattr(cls, "serializer_class", None)
+        )
+        if default is None:
             raise ValueError(
                 "Need to specify either 'serializer_class' or "
                 "serializer's default class"
             )
 
+        table = dict(cls.serializers)
+        for group, actions in (
+                ("write_only", ("create", "update", "partial_update",)),
+                ("read_only", ("list", "retrieve",)),
+        ):
+            for action in actions:
+                table[action] = (
+                    cls.serializers.get(action) or cls.serializers.get(group) or default
+                )
+        table[None] = default
+        # the dict is private and never changed, a read-only view of it is returned
+        cls._serializers_table = cls, table
+        return MappingProxyType(table)
 
     def get_serializer_class(self, serializer_name=None):
-        return (
-            self.__by_name(serializer_name)
-            or self.__by_action()
-            or self.__by_action_group()
-            or self.__default()
-            or super().get_serializer_class()
-        )
+        owner, table = self._serializers_table
+        if owner is not type(self):
+            self.get_serializers_table()
+            owner, table = self._serializers_table
+        if serializer_name is not None and serializer_name in table:
+            return table[serializer_name]
+        return table.get(self.action) or table[None]
 
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class(
@@ -75,25 +106,3 @@ class SerializersMixin(object):
         )
         kwargs['context'] = self.get_serializer_context()
         return serializer_class(*args, **kwargs)
-
-    def __by_name(self, name: str):
-        return self._serializers.get(name)
-
-    def __by_action(self):
-        return self._serializers.get(self.action)
-
-    def __by_action_group(self):
-        if self.action in ("create", "update", "partial_update",):
-            action = "write_only"
-        elif self.action in ("list", "retrieve",):
-            action = "read_only"
-        else:
-            return
-        return self._serializers.get(action)
-
-    # def __by_method(self):
-    #     return
-
-    def __default(self):
-        # "default" is for the back consistency
-        return self._serializers.get(self.default_serializer_name or "default")
@@ -0,0 +1,82 @@
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+
+
+class StreamingListMixin:
+    """
+    StreamingListMixin streams the list responses with the APIRenderer envelope, so the
+    large lists (e.g. exports) aren't kept in memory. The objects are loaded from
+    `queryset.iterator`, serialized and encoded by chunks, and sent by
+    a StreamingHttpResponse. The queryset and the serializer are taken in the usual way,
+    so it works with ConditionalQuerysetMixin and SerializersMixin.
+
+    The streamed list is not paginated. The status code is sent before the objects are
+    loaded, so an error in the middle of the stream just breaks the response.
+    If the accepted renderer can't stream (e.g. the browsable API), the usual response
+    is used.
+
+    stream_actions -- the actions, which are streamed by `list`.
+    stream_chunk_size -- a number of objects loaded, serialized and encoded at once.
+
+    Use `get_streaming_response` to stream a custom action:
+
+        @action(detail=False)
+        def export(self, request):
+            queryset = self.filter_queryset(self.get_queryset())
+            return self.get_streaming_response(queryset)
+    """
+    stream_actions = ('list',)
+    stream_chunk_size = 1000
+
+    def list(self, request, *args, **kwargs):
+        if not self.should_stream(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_streaming_response(queryset)
+
+    def should_stream(self, request) -> bool:
+        return self.action in self.stream_actions and self.can_stream(request)
+
+    def can_stream(self, request) -> bool:
+        return hasattr(getattr(request, 'accepted_renderer', None), 'render_stream')
+
+    def get_streaming_response(self, queryset, **serializer_kwargs):
+        """
+        :param queryset: the objects to stream
+        :param serializer_kwargs: the extra arguments of `get_serializer`
+        :return: a StreamingHttpResponse or a usual Response, if the accepted renderer
+        can't stream
+        """
+        if not self.can_stream(self.request):
+            serializer = self.get_serializer(queryset, many=True, **serializer_kwargs)
+            return Response(serializer.data)
+        renderer = self.request.accepted_renderer
+        content_type = self.request.accepted_media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(content_type=content_type)
+        response.exception = False  # the renderer reads it from the context
+        renderer_context = self.get_renderer_context()
+        renderer_context['response'] = response
+        response.streaming_content = renderer.render_stream(
+            self.get_stream_chunks(queryset, **serializer_kwargs),
+            self.request.accepted_media_type,
+            renderer_context,
+        )
+        return response
+
+    def get_stream_chunks(self, queryset, **serializer_kwargs):
+        chunk_size = self.stream_chunk_size
+        try:
+            objects = queryset.iterator(chunk_size=chunk_size)
+        except AttributeError:
+            objects = iter(queryset)  # e.g. a list
+        chunk = []
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                yield self.get_serializer(chunk, many=True, **serializer_kwargs).data
+                chunk = []
+        if chunk:
+            yield self.get_serializer(chunk, many=True, **serializer_kwargs).data
+
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import django
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+django.setup()
+
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+_databases = None
+
+
+def pytest_sessionstart(session):
+    global _databases
+    setup_test_environment()
+    _databases = setup_databases(verbosity=0, interactive=False)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _databases is not None:
+        teardown_databases(_databases, verbosity=0)
+        teardown_test_environment()
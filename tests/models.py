@@ -0,0 +1,119 @@
+from django.db import models
+
+from gears.models.change import OnChangeManager, OnChangeModel
+from gears.models.singleton import SingletonModel
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50, default='')
+
+
+class Product(OnChangeModel):
+    name = models.CharField(max_length=50, default='')
+    price = models.IntegerField(default=0)
+    note = models.TextField(default='')
+    author = models.ForeignKey(Author, null=True, on_delete=models.SET_NULL)
+
+    objects = OnChangeManager()
+
+    log = []
+
+    def on_change_name(self, old, new, adding):
+        type(self).log.append(('on_change_name', old, new))
+
+    def post_change_price(self, old, new, adding):
+        type(self).log.append(('post_change_price', old, new))
+
+    def post_change_author(self, old, new, adding):
+        type(self).log.append(('post_change_author', old, new))
+
+
+class Review(models.Model):
+    product = models.ForeignKey(Product, related_name='reviews', on_delete=models.CASCADE)
+    reviewer = models.ForeignKey(Author, on_delete=models.CASCADE)
+    text = models.TextField(default='')
+
+
+class DirtyProduct(Product):
+    update_changed_fields_only = True
+
+    class Meta:
+        proxy = True
+
+
+class QueuedProduct(Product):
+    post_change_on_commit = True
+
+    class Meta:
+        proxy = True
+
+
+class NotedProduct(Product):
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        self.note = 'saved'
+        super().save(*args, **kwargs)
+
+
+class CountingProduct(Product):
+    class Meta:
+        proxy = True
+
+    def on_change_price(self, old, new, adding):
+        type(self).log.append(('on_change_price', Author.objects.count()))
+
+    def after_save(self):
+        type(self).log.append(('after_save', Author.objects.count()))
+
+
+class AsyncHookProduct(Product):
+    class Meta:
+        proxy = True
+
+    async def on_change_price(self, old, new, adding):
+        type(self).log.append(('on_change_price', await Author.objects.acount()))
+
+
+class SiteConfig(SingletonModel):
+    title = models.CharField(max_length=50, default='')
+    use_cache = True
+    cache_alias = 'default'
+
+
+class PlainConfig(SingletonModel):
+    title = models.CharField(max_length=50, default='')
+    note = models.CharField(max_length=50, default='')
+
+
+try:
+    from gears.models.jwt import JWTUserModelMixin
+except ImportError:  # cryptography or simplejwt is not installed
+    JWTUserModelMixin = None
+
+if JWTUserModelMixin is not None:
+    class TokenUser(JWTUserModelMixin, models.Model):
+        email = models.CharField(max_length=50, default='')
+
+        def get_public_jwt_data(self) -> dict:
+            return {'email': self.email}
+
+        def get_private_jwt_data(self) -> dict:
+            return {'secret': f'secret-{self.pk}'}
+
+    class ExtendedTokenUser(TokenUser):
+        class Meta:
+            proxy = True
+
+        def extend_token(self, token):
+            token = super().extend_token(token)
+            token['extended'] = True
+            return token
+
+    class ListPrivateTokenUser(TokenUser):
+        class Meta:
+            proxy = True
+
+        def get_private_jwt_data(self):
+            return ['secret-list']
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+SECRET_KEY = 'gears-tests'
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'rest_framework',
+    'tests',
+]
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'gears-tests.sqlite3'),
+        'TEST': {
+            # a file, so the threads of the concurrency tests share the database
+            'NAME': os.path.join(tempfile.gettempdir(), 'gears-tests-db.sqlite3'),
+        },
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+USE_TZ = True
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+# the key of the tests only
+JWT_PAYLOAD_ENCRYPTION_KEY = b'eT4xAYx1QTynivq1wgSAl-X6bTqWWeMvg2vwWolSkbY='
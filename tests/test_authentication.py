@@ -0,0 +1,115 @@
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory
+
+try:
+    from gears.authentication.jwt import (
+        _MISSING as MISSING,
+        JWTStatelessAuthentication,
+        JWTTokenUser,
+        PrivateDataCache,
+        get_private_data,
+        get_private_data_cache,
+    )
+    from gears.models.jwt import PRIVATE_CLAIM, TokenEncryption
+    from rest_framework_simplejwt.tokens import AccessToken
+except ImportError:  # cryptography or simplejwt is not installed
+    AccessToken = None
+
+
+@skipIf(AccessToken is None, 'cryptography or simplejwt is not installed')
+class PrivateDataCacheTest(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PrivateDataCache(maxsize=2, ttl=300)
+        cache.set('a', 1, now=0)
+        cache.set('b', 2, now=0)
+        self.assertEqual(cache.get('a', now=1), 1)  # `b` is the oldest one now
+        cache.set('c', 3, now=1)
+        self.assertIs(cache.get('b', now=1), MISSING)
+        self.assertEqual(cache.get('a', now=1), 1)
+        self.assertEqual(cache.get('c', now=1), 3)
+
+    def test_entry_expires_by_ttl(self):
+        cache = PrivateDataCache(maxsize=2, ttl=10)
+        cache.set('a', 1, now=100)
+        self.assertEqual(cache.get('a', now=109), 1)
+        self.assertIs(cache.get('a', now=110), MISSING)
+
+    def test_entry_never_outlives_token(self):
+        cache = PrivateDataCache(maxsize=2, ttl=300)
+        cache.set('a', 1, now=100, exp=105)
+        self.assertEqual(cache.get('a', now=104), 1)
+        self.assertIs(cache.get('a', now=105), MISSING)
+
+
+@skipIf(AccessToken is None, 'cryptography or simplejwt is not installed')
+class GetPrivateDataTest(SimpleTestCase):
+    def setUp(self):
+        get_private_data_cache().clear()
+
+    def get_token(self, data: dict):
+        token = AccessToken()
+        token[PRIVATE_CLAIM] = TokenEncryption.encrypt_data(data).decode()
+        return AccessToken(str(token))
+
+    def test_private_data_is_decrypted_once(self):
+        token = self.get_token({'address': 'secret'})
+        decrypt = mock.Mock(wraps=TokenEncryption.decrypt_data)
+        with mock.patch.object(TokenEncryption, 'decrypt_data', decrypt):
+            first = get_private_data(token)
+            first['address'] = 'changed'  # the cached payload is a copy
+            second = get_private_data(token)
+        self.assertEqual(second, {'address': 'secret'})
+        self.assertEqual(decrypt.call_count, 1)
+
+    def test_token_without_private_data(self):
+        self.assertEqual(get_private_data(AccessToken()), {})
+
+
+@skipIf(AccessToken is None, 'cryptography or simplejwt is not installed')
+class JWTStatelessAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='alice', first_name='Alice')
+
+    def authenticate(self, include_private_data=False):
+        token = AccessToken.for_user(self.user)
+        token['email'] = 'alice@example.com'
+        token[PRIVATE_CLAIM] = TokenEncryption.encrypt_data({'address': 'x'}).decode()
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        authentication = JWTStatelessAuthentication()
+        authentication.include_private_data = include_private_data
+        user, _ = authentication.authenticate(request)
+        return user
+
+    def test_claims_are_served_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate(include_private_data=True)
+            self.assertIsInstance(user, JWTTokenUser)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.id, self.user.pk)
+            self.assertEqual(user.email, 'alice@example.com')
+            self.assertEqual(user.address, 'x')
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user, self.user)
+
+    def test_other_attributes_load_user_once(self):
+        user = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, 'Alice')
+            self.assertEqual(user.username, 'alice')
+        self.assertEqual(user.get_instance(), self.user)
+
+    def test_private_data_is_not_claims_by_default(self):
+        user = self.authenticate()
+        with self.assertRaises(AttributeError):
+            user.address  # not in the claims and not a user attribute
+
+    def test_user_is_read_only(self):
+        user = self.authenticate()
+        with self.assertRaises(AttributeError):
+            user.email = 'bob@example.com'
+        with self.assertRaises(NotImplementedError):
+            user.save()
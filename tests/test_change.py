@@ -0,0 +1,206 @@
+from django.db.models import F
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from .models import (
+    AsyncHookProduct,
+    Author,
+    CountingProduct,
+    DirtyProduct,
+    NotedProduct,
+    Product,
+    QueuedProduct,
+)
+
+
+class DeferredFieldsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create(
+            [Product(name=f'p{i}', price=i, note='x' * 100) for i in range(10)]
+        )
+
+    def setUp(self):
+        Product.log = []
+
+    def test_iterating_deferred_queryset_makes_single_query(self):
+        with self.assertNumQueries(1):
+            products = list(Product.objects.only('id', 'name'))
+        self.assertEqual(len(products), 10)
+
+    def test_deferred_field_is_tracked_once_loaded(self):
+        product = Product.objects.only('id', 'name').get(name='p3')
+        with self.assertNumQueries(1):
+            product.price  # loads the deferred field
+        product.price = 100
+        product.save()
+        self.assertIn(('post_change_price', 3, 100), Product.log)
+
+
+class TrackedUpdateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create([Product(name=f'p{i}', price=i) for i in range(5)])
+
+    def setUp(self):
+        Product.log = []
+
+    def test_expressions_are_resolved_for_post_change(self):
+        rows = Product.objects.filter(price__lt=3).update(price=F('price') + 100)
+        self.assertEqual(rows, 3)
+        self.assertEqual(
+            sorted(Product.log),
+            [('post_change_price', i, i + 100) for i in range(3)],
+        )
+        self.assertEqual(
+            sorted(Product.objects.values_list('price', flat=True)),
+            [3, 4, 100, 101, 102],
+        )
+
+    def test_update_is_written_by_chunks(self):
+        queryset = Product.objects.all()
+        queryset.update_batch_size = 2
+        with self.assertNumQueries(1 + 3):  # the chunks are read by a single cursor
+            self.assertEqual(queryset.update(name='x'), 5)
+        self.assertEqual(len(Product.log), 5)
+        self.assertEqual(Product.log[0][0], 'on_change_name')
+
+
+class ChangedFieldsOnlyTest(TestCase):
+    def setUp(self):
+        Product.log = []
+
+    def test_changed_fields_are_compared_with_the_last_saved_values(self):
+        product = DirtyProduct.objects.create(price=1)
+        product = DirtyProduct.objects.get(pk=product.pk)
+        product.price = 2
+        product.save()
+        product.price = 1
+        with self.assertNumQueries(1):
+            product.save()
+        self.assertEqual(DirtyProduct.objects.get(pk=product.pk).price, 1)
+        with self.assertNumQueries(0):
+            product.save()  # nothing has changed
+
+    def test_foreign_key_change_runs_post_change(self):
+        first, second = Author.objects.create(), Author.objects.create()
+        product = DirtyProduct.objects.create(author=first)
+        product = DirtyProduct.objects.get(pk=product.pk)
+        product.author = second
+        product.save()
+        self.assertIn('post_change_author', [entry[0] for entry in Product.log])
+        self.assertEqual(DirtyProduct.objects.get(pk=product.pk).author, second)
+
+
+class AsyncSaveTest(TestCase):
+    def setUp(self):
+        Product.log = []
+
+    async def test_asave_runs_hooks(self):
+        product = Product(price=1)
+        await product.asave()
+        product.price = 2
+        await product.asave()
+        self.assertEqual(Product.log, [('post_change_price', 1, 2)])
+
+    async def test_asave_calls_overridden_save(self):
+        product = NotedProduct(price=1)
+        product.price = 5
+        await product.asave()
+        saved = await Product.objects.aget(pk=product.pk)
+        self.assertEqual(saved.note, 'saved')
+        self.assertEqual(Product.log, [('post_change_price', 1, 5)])
+
+    async def test_asave_runs_sync_hooks_using_orm(self):
+        await Author.objects.acreate()
+        product = CountingProduct(price=1)
+        product.price = 2
+        await product.asave()
+        self.assertEqual(
+            Product.log,
+            [('on_change_price', 1), ('post_change_price', 1, 2), ('after_save', 1)],
+        )
+
+    async def test_asave_awaits_coroutine_hooks(self):
+        product = AsyncHookProduct(price=1)
+        product.price = 2
+        await product.asave()
+        self.assertEqual(
+            Product.log, [('on_change_price', 0), ('post_change_price', 1, 2)],
+        )
+
+
+class PostChangeOnCommitTest(TransactionTestCase):
+    def setUp(self):
+        self.product = QueuedProduct.objects.get(
+            pk=Product.objects.create(price=10).pk,
+        )
+        Product.log = []
+
+    def test_rolled_back_savepoint_is_skipped(self):
+        with transaction.atomic():
+            self.product.price = 2000
+            self.product.save()
+            try:
+                with transaction.atomic():
+                    self.product.price = 2001
+                    self.product.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(Product.log, [('post_change_price', 10, 2000)])
+        self.assertEqual(QueuedProduct.objects.get(pk=self.product.pk).price, 2000)
+
+    def test_released_savepoint_is_merged(self):
+        with transaction.atomic():
+            self.product.price = 2000
+            self.product.save()
+            with transaction.atomic():
+                self.product.price = 2001
+                self.product.save()
+        self.assertEqual(Product.log, [('post_change_price', 10, 2001)])
+
+
+class OriginValuesTest(TestCase):
+    def test_counter_and_called_methods_origin_values(self):
+        product = Product(name='a')
+        counter = product.get_origin_name('counter')
+        called_methods = product.get_origin_name('called_methods')
+        self.assertEqual(product.get_origin_value(counter), 0)
+        self.assertEqual(product.get_origin_value(called_methods), [])
+        product.name = 'b'
+        product.save()
+        self.assertEqual(product.get_origin_value(counter), 1)
+        self.assertEqual(product.get_origin_value(called_methods), ['on_change_name'])
+        self.assertEqual(product.get_origin_value(product.get_origin_name('name')), 'a')
+
+
+class ForeignKeyOriginTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first, cls.second = Author.objects.create(), Author.objects.create()
+        Product.objects.bulk_create(
+            [Product(name=f'p{i}', author=cls.first) for i in range(5)]
+        )
+
+    def setUp(self):
+        Product.log = []
+
+    def test_iterating_queryset_doesnt_load_related_objects(self):
+        with self.assertNumQueries(1):
+            products = list(Product.objects.all())
+        self.assertEqual(len(products), 5)
+        with self.assertNumQueries(1):
+            products = list(Product.objects.select_related('author'))
+        with self.assertNumQueries(0):
+            self.assertEqual(products[0].author, self.first)
+
+    def test_changed_foreign_key_passes_related_objects(self):
+        product = Product.objects.first()
+        product.author = self.second
+        product.save()
+        self.assertEqual(
+            Product.log, [('post_change_author', self.first, self.second)],
+        )
+        origin_name = product.get_origin_name('author')
+        self.assertEqual(product.get_origin_value(origin_name), self.first)
@@ -0,0 +1,75 @@
+from django.test import TestCase
+from rest_framework import serializers, viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from gears.viewsets.conditional_get import ConditionalGetMixin
+
+from .models import Product
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'price']
+
+
+class ProductViewSet(ConditionalGetMixin, viewsets.GenericViewSet):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    calls = []
+
+    def list(self, request):
+        type(self).calls.append(self.action)
+        return Response(self.get_serializer(self.get_queryset(), many=True).data)
+
+
+class VersionedProductViewSet(ProductViewSet):
+    def get_list_etag_version(self):
+        return self.get_queryset_version('price')
+
+
+class ConditionalGetTest(TestCase):
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create([Product(name=f'p{i}', price=i) for i in range(3)])
+
+    def setUp(self):
+        ProductViewSet.calls = []
+
+    def get(self, viewset, etag=None):
+        headers = {} if etag is None else {'HTTP_IF_NONE_MATCH': etag}
+        request = self.factory.get('/products/', **headers)
+        response = viewset.as_view({'get': 'list'})(request)
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    def test_content_etag(self):
+        response = self.get(ProductViewSet)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = self.get(ProductViewSet, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(ProductViewSet.calls), 2)  # the traffic is saved only
+        self.assertEqual(self.get(ProductViewSet, '"other"').status_code, 200)
+
+    def test_version_precheck_skips_action(self):
+        response = self.get(VersionedProductViewSet)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with self.assertNumQueries(1):  # the version aggregation only
+            response = self.get(VersionedProductViewSet, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(ProductViewSet.calls), 1)
+
+    def test_version_changes_with_data(self):
+        etag = self.get(VersionedProductViewSet)['ETag']
+        Product.objects.filter(name='p0').delete()
+        response = self.get(VersionedProductViewSet, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
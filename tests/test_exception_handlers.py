@@ -0,0 +1,116 @@
+from django.test import SimpleTestCase, override_settings
+from rest_framework import exceptions, serializers
+
+from gears.renderers.exception_handlers import ExceptionHandler
+from gears.renderers.types import Error
+
+
+class ItemSerializer(serializers.Serializer):
+    price = serializers.IntegerField()
+    tags = serializers.ListField(child=serializers.IntegerField())
+
+
+class OrderSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    items = ItemSerializer(many=True)
+    codes = serializers.ListField(child=serializers.IntegerField(max_value=10))
+
+
+class LeafLocationHandler(ExceptionHandler):
+    location_as_path = False
+
+
+class LimitedHandler(ExceptionHandler):
+    max_errors = 2
+
+
+def error(code, location, description):
+    return {'code': code, 'location': location, 'description': description, 'detail': None}
+
+
+REQUIRED = 'This field is required.'
+INVALID = 'A valid integer is required.'
+MAX_VALUE = 'Ensure this value is less than or equal to 10.'
+
+
+class ExceptionHandlerTest(SimpleTestCase):
+    def get_errors(self, exc, handler_class=ExceptionHandler) -> list:
+        return handler_class(exc, {}).handle().data['errors']
+
+    def get_validation_error(self):
+        serializer = OrderSerializer(data={
+            'items': [{'price': 1, 'tags': [1]}, {'price': 'x', 'tags': [1, 'y']}],
+            'codes': [1, 20, 'z'],
+        })
+        self.assertFalse(serializer.is_valid())
+        return serializers.ValidationError(serializer.errors)
+
+    def test_nested_locations_are_paths(self):
+        self.assertEqual(self.get_errors(self.get_validation_error()), [
+            error('value_required', 'name', REQUIRED),
+            error('invalid', 'items.1.price', INVALID),
+            error('invalid', 'items.1.tags.1', INVALID),
+            error('max_value', 'codes.1', MAX_VALUE),
+            error('invalid', 'codes.2', INVALID),
+        ])
+
+    def test_many_serializer_locations(self):
+        serializer = ItemSerializer(data=[{'price': 1, 'tags': []}, {}], many=True)
+        self.assertFalse(serializer.is_valid())
+        exc = serializers.ValidationError(serializer.errors)
+        self.assertEqual(self.get_errors(exc), [
+            error('value_required', '1.price', REQUIRED),
+            error('value_required', '1.tags', REQUIRED),
+        ])
+
+    def test_leaf_locations_match_previous_output(self):
+        # the output of the handler before the paths were added
+        self.assertEqual(
+            self.get_errors(self.get_validation_error(), LeafLocationHandler), [
+                error('value_required', 'name', REQUIRED),
+                error('invalid', 'price', INVALID),
+                error('invalid', 1, INVALID),
+                error('max_value', 1, MAX_VALUE),
+                error('invalid', 2, INVALID),
+            ],
+        )
+
+    def test_not_validation_error(self):
+        for handler_class in (ExceptionHandler, LeafLocationHandler):
+            errors = self.get_errors(exceptions.NotAuthenticated(), handler_class)
+            self.assertEqual(errors, [error(
+                'not_authenticated', None,
+                'Authentication credentials were not provided.',
+            )])
+
+    def test_max_errors_summary(self):
+        errors = self.get_errors(self.get_validation_error(), LimitedHandler)
+        self.assertEqual(errors[:2], [
+            error('value_required', 'name', REQUIRED),
+            error('invalid', 'items.1.price', INVALID),
+        ])
+        self.assertEqual(errors[2], {
+            'code': 'more_errors',
+            'location': None,
+            'description': '3 more errors',
+            'detail': {'count': 3},
+        })
+        self.assertEqual(len(errors), 3)
+
+    @override_settings(RESPONSE_ERROR_MAPPING={
+        'invalid': Error(code='wrong_value', description='Wrong value.'),
+        'max_value': Error(location='limits', detail={'max': 10}),
+    })
+    def test_error_mapping_templates(self):
+        errors = self.get_errors(self.get_validation_error())
+        self.assertEqual(errors, [
+            # not mapped, the default mapping isn't used with the custom one
+            error('required', 'name', REQUIRED),
+            error('wrong_value', 'items.1.price', 'Wrong value.'),
+            error('wrong_value', 'items.1.tags.1', 'Wrong value.'),
+            {
+                'code': 'max_value', 'location': 'limits', 'description': MAX_VALUE,
+                'detail': {'max': 10},
+            },
+            error('wrong_value', 'codes.2', 'Wrong value.'),
+        ])
@@ -0,0 +1,87 @@
+from unittest import skipIf
+
+import json
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import models
+
+try:
+    from gears.models.jwt import COMPACT_JSON, COMPACT_ZLIB, PRIVATE_CLAIM, TokenEncryption
+    from rest_framework_simplejwt.tokens import RefreshToken
+except ImportError:  # cryptography or simplejwt is not installed
+    RefreshToken = None
+
+
+@skipIf(RefreshToken is None, 'cryptography or simplejwt is not installed')
+class TokensPairsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        models.TokenUser.objects.bulk_create(
+            [models.TokenUser(email=f'u{i}@example.com') for i in range(5)]
+        )
+
+    def get_claims(self, pair: dict) -> dict:
+        payload = RefreshToken(pair['refresh']).payload
+        payload[PRIVATE_CLAIM] = TokenEncryption.decrypt_data(payload[PRIVATE_CLAIM])
+        return payload
+
+    def assert_same_claims(self, model, **kwargs):
+        pairs = list(model.get_tokens_pairs(chunk_size=2, **kwargs))
+        self.assertEqual(len(pairs), 5)
+        for user, pair in pairs:
+            claims = self.get_claims(pair)
+            expected = self.get_claims(user.get_tokens_pair())
+            for name in ('email', PRIVATE_CLAIM, 'extended', 'user_id'):
+                self.assertEqual(claims.get(name), expected.get(name))
+
+    def test_batch_tokens_match_single_ones(self):
+        self.assert_same_claims(models.TokenUser)
+        self.assert_same_claims(models.TokenUser, workers=2)
+
+    def test_batch_tokens_use_overridden_extend_token(self):
+        self.assert_same_claims(models.ExtendedTokenUser, workers=2)
+        user, pair = next(models.ExtendedTokenUser.get_tokens_pairs())
+        self.assertIs(self.get_claims(pair)['extended'], True)
+
+    def test_private_data_is_always_encrypted(self):
+        user = models.ListPrivateTokenUser.objects.first()
+        pairs = [user.get_tokens_pair()]
+        pairs += [pair for _, pair in models.ListPrivateTokenUser.get_tokens_pairs()]
+        for pair in pairs:
+            private = RefreshToken(pair['refresh']).payload[PRIVATE_CLAIM]
+            self.assertIsInstance(private, str)
+            self.assertNotIn('secret-list', private)
+            self.assertEqual(TokenEncryption.decrypt_data(private), ['secret-list'])
+
+
+@skipIf(RefreshToken is None, 'cryptography or simplejwt is not installed')
+class TokenEncryptionFormatTest(SimpleTestCase):
+    data = {'address': 'x' * 500, 'ids': list(range(50))}
+
+    def decrypt_raw(self, encrypted: bytes) -> bytes:
+        return TokenEncryption.get_cipher().decrypt(TokenEncryption._pad(encrypted))
+
+    def test_plain_json_by_default(self):
+        encrypted = TokenEncryption.encrypt_data(self.data)
+        self.assertEqual(json.loads(self.decrypt_raw(encrypted)), self.data)
+
+    def test_legacy_plain_json_is_decrypted_in_compact_mode(self):
+        legacy = TokenEncryption.get_cipher().encrypt(json.dumps(self.data).encode())
+        with override_settings(GEARS={'jwt_private_compact': True}):
+            self.assertEqual(TokenEncryption.decrypt_data(legacy), self.data)
+            self.assertEqual(
+                TokenEncryption.decrypt_data(legacy.decode().rstrip('=')), self.data,
+            )
+
+    def test_compact_payloads_round_trip(self):
+        for threshold, version in ((None, COMPACT_JSON), (256, COMPACT_ZLIB)):
+            conf = {
+                'jwt_private_compact': True,
+                'jwt_private_compression_threshold': threshold,
+            }
+            with self.subTest(threshold=threshold), override_settings(GEARS=conf):
+                encrypted = TokenEncryption.encrypt_data(self.data)
+                self.assertFalse(encrypted.endswith(b'='))
+                self.assertEqual(self.decrypt_raw(encrypted)[:1], version)
+                self.assertEqual(TokenEncryption.decrypt_data(encrypted), self.data)
@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.routers import SimpleRouter
+from rest_framework.test import APIRequestFactory
+
+from gears.viewsets.permissions import PermissionsMixin
+
+
+class SampleViewSet(PermissionsMixin, viewsets.ViewSet):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def list(self, request):
+        return Response([])
+
+    @action(detail=False, permission_classes=[IsAdminUser])
+    def admin_only(self, request):
+        return Response([])
+
+
+class MappedSampleViewSet(SampleViewSet):
+    permission_classes = []
+    permissions = {
+        'default': [IsAdminUser],
+        'list': [AllowAny],
+    }
+
+
+class SharedSampleViewSet(SampleViewSet):
+    reuse_permission_instances = True
+
+
+class ActionPermissionsTest(SimpleTestCase):
+    factory = APIRequestFactory()
+
+    def get_view(self, viewset, name):
+        router = SimpleRouter()
+        router.register('samples', viewset, basename='sample')
+        return next(url.callback for url in router.urls if url.name == name)
+
+    def test_action_permission_classes_are_checked(self):
+        for viewset in (SampleViewSet, SharedSampleViewSet):
+            with self.subTest(viewset=viewset.__name__):
+                list_view = self.get_view(viewset, 'sample-list')
+                response = list_view(self.factory.get('/samples/'))
+                self.assertEqual(response.status_code, 200)
+
+                admin_view = self.get_view(viewset, 'sample-admin-only')
+                response = admin_view(self.factory.get('/samples/admin_only/'))
+                self.assertEqual(response.status_code, 403)
+
+    def test_permissions_mapping(self):
+        view = MappedSampleViewSet()
+        view.action = 'list'
+        self.assertEqual(view.get_permission_classes(), [AllowAny])
+        view.action = 'retrieve'
+        self.assertEqual(view.get_permission_classes(), [IsAdminUser])
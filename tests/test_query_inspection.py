@@ -0,0 +1,90 @@
+from django.test import TestCase
+from rest_framework import mixins, serializers, viewsets
+from rest_framework.test import APIRequestFactory
+
+from gears.exceptions.views import QueryInspectionError
+from gears.viewsets.query_inspection import (
+    QueryInspectionMixin,
+    get_query_template,
+    inspect_view_queries,
+)
+
+from .models import Author, Product
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.name')
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'author_name']
+
+
+class ProductViewSet(
+    QueryInspectionMixin, mixins.ListModelMixin, viewsets.GenericViewSet,
+):
+    queryset = Product.objects.all()  # the authors are loaded row by row
+    serializer_class = ProductSerializer
+    query_budgets = {'list': 10}
+
+
+class JoinedProductViewSet(ProductViewSet):
+    queryset = Product.objects.select_related('author')
+    query_budgets = {'list': 1}
+
+
+class QueryInspectionTest(TestCase):
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            Product.objects.create(name=f'p{i}', author=Author.objects.create())
+
+    def get(self, viewset):
+        return viewset.as_view({'get': 'list'})(self.factory.get('/products/'))
+
+    def test_repeated_queries_raise(self):
+        with self.assertRaises(QueryInspectionError) as raised:
+            with inspect_view_queries():
+                self.get(ProductViewSet)
+        report = raised.exception.report
+        self.assertEqual(report.total, 6)
+        # the list queryset is evaluated by the serializer as well
+        self.assertEqual(report.phases['serialization'], 6)
+        self.assertIn('5 same queries in `serialization`', str(raised.exception))
+
+    def test_budget_raises(self):
+        viewset = type(
+            'TightViewSet', (JoinedProductViewSet,),
+            {'query_budgets': {}, 'query_budget': 0},
+        )
+        with self.assertRaises(QueryInspectionError) as raised:
+            with inspect_view_queries():
+                self.get(viewset)
+        self.assertIn('1 queries, the budget of `list` is 0', str(raised.exception))
+
+    def test_reports_are_collected(self):
+        with inspect_view_queries() as reports:
+            response = self.get(JoinedProductViewSet)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].action, 'list')
+        self.assertEqual(reports[0].total, 1)
+        self.assertEqual(reports[0].get_repeated(2), [])
+
+    def test_problems_are_logged_if_not_strict(self):
+        with self.assertLogs('gears.queries', 'WARNING'):
+            with inspect_view_queries(strict=False):
+                self.get(ProductViewSet)
+
+    def test_not_inspected_by_default(self):
+        with self.assertNumQueries(6):
+            response = self.get(ProductViewSet)
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_template(self):
+        self.assertEqual(
+            get_query_template("SELECT 1 FROM t WHERE a = 'x' AND b IN (%s, %s, %s)"),
+            'SELECT %s FROM t WHERE a = %s AND b IN (%s, ...)',
+        )
@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import mixins, serializers, viewsets
+from rest_framework.test import APIRequestFactory
+
+from gears.viewsets.query_plan import QuerysetPlan, build_queryset_plan
+from gears.viewsets.querysets import ConditionalQuerysetMixin
+
+from .models import Author, Product, Review
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Author
+        fields = ['id', 'name']
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    author = AuthorSerializer()
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'author']
+
+
+class ProductPkSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'author']  # PrimaryKeyRelatedField
+
+
+class ProductMethodSerializer(serializers.ModelSerializer):
+    label = serializers.SerializerMethodField()
+    author_name = serializers.CharField(source='author.name')
+
+    class Meta:
+        model = Product
+        fields = ['id', 'label', 'author_name']
+
+    def get_label(self, obj):
+        return f'{obj.name}: {obj.price}'
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    reviewer = AuthorSerializer()
+
+    class Meta:
+        model = Review
+        fields = ['id', 'text', 'reviewer']
+
+
+class ReviewedProductSerializer(serializers.ModelSerializer):
+    reviews = ReviewSerializer(many=True)
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'reviews']
+
+
+class ProductViewSet(
+    ConditionalQuerysetMixin, mixins.ListModelMixin, viewsets.GenericViewSet,
+):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    auto_queryset_plan = True
+
+
+class QuerysetPlanTest(TestCase):
+    def test_nested_serializer_is_joined(self):
+        self.assertEqual(build_queryset_plan(ProductSerializer(), Product), QuerysetPlan(
+            select_related=('author',),
+            only=('author', 'author__id', 'author__name', 'id', 'name'),
+        ))
+
+    def test_pk_only_related_field_reads_column(self):
+        self.assertEqual(
+            build_queryset_plan(ProductPkSerializer(), Product),
+            QuerysetPlan(only=('author', 'id')),
+        )
+
+    def test_method_field_reads_whole_object(self):
+        plan = build_queryset_plan(ProductMethodSerializer(), Product)
+        self.assertEqual(plan.select_related, ('author',))
+        self.assertEqual(
+            plan.only, ('author', 'author__name', 'id', 'name', 'note', 'price'),
+        )
+
+    def test_relations_beyond_many_relation_are_prefetched(self):
+        self.assertEqual(
+            build_queryset_plan(ReviewedProductSerializer(), Product),
+            QuerysetPlan(
+                prefetch_related=('reviews', 'reviews__reviewer'),
+                only=('id', 'name'),
+            ),
+        )
+
+
+class AutoQuerysetPlanTest(TestCase):
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            author = Author.objects.create(name=f'a{i}')
+            product = Product.objects.create(name=f'p{i}', author=author, note='x')
+            for j in range(2):
+                Review.objects.create(product=product, reviewer=author, text=f'r{j}')
+
+    def get_list(self, **attrs):
+        viewset = type('PlannedViewSet', (ProductViewSet,), attrs)
+        view = viewset.as_view({'get': 'list'})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(self.factory.get('/products/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+        return [query['sql'] for query in queries]
+
+    def test_nested_serializer_query_count(self):
+        self.assertEqual(len(self.get_list()), 1)
+        self.assertEqual(len(self.get_list(auto_queryset_plan=False)), 1 + 5)
+
+    def test_reverse_foreign_key_query_count(self):
+        attrs = {'serializer_class': ReviewedProductSerializer}
+        self.assertEqual(len(self.get_list(**attrs)), 3)
+        queries = self.get_list(**attrs, auto_queryset_plan=False)
+        self.assertEqual(len(queries), 1 + 5 + 5 * 2)
+
+    def test_projection(self):
+        first = self.get_list()[0]
+        self.assertNotIn('"tests_product"."note"', first)
+        self.assertIn('"tests_author"."name"', first)
+        first = self.get_list(auto_queryset_only=False)[0]
+        self.assertIn('"tests_product"."note"', first)
@@ -0,0 +1,54 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+
+from gears.renderers.backends import orjson
+from gears.renderers.renderer import APIRenderer, FastAPIRenderer
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastAPIRendererTest(SimpleTestCase):
+    def render(self, renderer_class, data, status=200, exception=False):
+        response = Response(status=status)
+        response.exception = exception
+        return renderer_class().render(
+            data, 'application/json', {'response': response},
+        )
+
+    def assert_same_output(self, data, **kwargs):
+        self.assertEqual(
+            self.render(FastAPIRenderer, data, **kwargs),
+            self.render(APIRenderer, data, **kwargs),
+        )
+
+    def test_same_output(self):
+        self.assert_same_output({
+            'id': uuid.UUID('c65e9bf7-1724-4593-bf57-394cea491887'),
+            'name': 'Проверка   "quotes"',
+            'price': Decimal('10.50'),
+            'ratio': 0.1,
+            'created': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+            'day': datetime.date(2024, 1, 2),
+            'tags': ['a', None, True, 1 << 70],
+            'nested': {'1': {'empty': []}},
+        })
+
+    def test_same_paginated_and_error_output(self):
+        self.assert_same_output(
+            {'count': 2, 'next': None, 'previous': None, 'results': [{'a': 1}, {'a': 2}]},
+        )
+        self.assert_same_output(
+            {'errors': [{'code': 'invalid', 'location': 'price'}]},
+            status=400, exception=True,
+        )
+
+    def test_non_finite_floats_raise_as_drf_does(self):
+        for value in (float('nan'), float('inf'), Decimal('-Infinity')):
+            for renderer_class in (APIRenderer, FastAPIRenderer):
+                with self.subTest(value=value, renderer=renderer_class.__name__):
+                    with self.assertRaises(ValueError):
+                        self.render(renderer_class, {'values': [1.5, value]})
@@ -0,0 +1,123 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework import serializers, viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from gears.viewsets.response_cache import CachedResponseMixin
+
+from .models import DirtyProduct, Product
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'name']
+
+
+class ProductViewSet(CachedResponseMixin, viewsets.GenericViewSet):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    cache_models = (Product,)
+    cache_lock_timeout = 0.3
+    calls = []
+    keys = []
+
+    def list(self, request):
+        type(self).calls.append(request.user.pk)
+        queryset = self.get_queryset()
+        if request.user.is_authenticated:
+            queryset = queryset.filter(name=request.user.username)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def get_response_cache_key(self, request) -> str:
+        key = super().get_response_cache_key(request)
+        type(self).keys.append(key)
+        return key
+
+
+class CachedResponseTest(TestCase):
+    factory = APIRequestFactory()
+    view = staticmethod(ProductViewSet.as_view({'get': 'list'}))
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create(username='alice')
+        cls.bob = User.objects.create(username='bob')
+        Product.objects.create(name='alice')
+        Product.objects.create(name='bob')
+
+    def setUp(self):
+        caches['default'].clear()
+        ProductViewSet.calls, ProductViewSet.keys = [], []
+
+    def get(self, path='/products/', user=None):
+        request = self.factory.get(path)
+        if user is not None:
+            force_authenticate(request, user)
+        response = self.view(request)
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    def test_response_is_cached(self):
+        first = self.get('/products/?a=1&b=2')
+        with self.assertNumQueries(0):
+            second = self.get('/products/?b=2&a=1')  # the params order doesn't matter
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(ProductViewSet.calls, [None])
+        self.get('/products/?a=2')
+        self.assertEqual(len(ProductViewSet.calls), 2)
+
+    def test_responses_vary_on_authenticated_user(self):
+        alice = self.get(user=self.alice)
+        bob = self.get(user=self.bob)
+        self.assertNotEqual(alice.content, bob.content)
+        self.assertIn(b'alice', alice.content)
+        self.assertIn(b'bob', bob.content)
+        self.assertEqual(self.get(user=self.alice).content, alice.content)
+        self.assertEqual(ProductViewSet.calls, [self.alice.pk, self.bob.pk])
+
+    def test_saving_proxy_object_invalidates_cache(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            product = DirtyProduct.objects.get(name='bob')
+            product.name = 'carol'
+            product.save()
+        response = self.get()
+        self.assertIn(b'carol', response.content)
+        self.assertEqual(len(ProductViewSet.calls), 2)
+
+    def test_deleting_object_invalidates_cache(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.filter(name='bob').first().delete()
+        self.assertNotIn(b'bob', self.get().content)
+
+    def test_concurrent_request_waits_for_computed_response(self):
+        self.get()  # learn the key
+        key = ProductViewSet.keys[-1]
+        cache = caches['default']
+        cached = cache.get(key)
+        cache.delete(key)
+        cache.add(f'{key}:lock', 1)  # another request computes it
+        timer = threading.Timer(0.1, cache.set, (key, cached))
+        timer.start()
+        try:
+            response = self.get()
+        finally:
+            timer.join()
+        self.assertEqual(response.content, cached[0])
+        self.assertEqual(len(ProductViewSet.calls), 1)
+
+    def test_request_computes_response_after_lock_timeout(self):
+        self.get()
+        key = ProductViewSet.keys[-1]
+        cache = caches['default']
+        cache.delete(key)
+        cache.add(f'{key}:lock', 1)  # the computing request hangs
+        self.get()
+        self.assertEqual(len(ProductViewSet.calls), 2)
@@ -0,0 +1,104 @@
+import warnings
+
+from django.test import SimpleTestCase
+from rest_framework import serializers, viewsets
+
+from gears.viewsets.serializers import SerializersMixin
+
+
+class DefaultSerializer(serializers.Serializer):
+    pass
+
+
+class ListSerializer(serializers.Serializer):
+    pass
+
+
+class ReadSerializer(serializers.Serializer):
+    pass
+
+
+class WriteSerializer(serializers.Serializer):
+    pass
+
+
+class CustomSerializer(serializers.Serializer):
+    pass
+
+
+class MappedViewSet(SerializersMixin, viewsets.GenericViewSet):
+    serializers = {
+        None: DefaultSerializer,
+        'list': ListSerializer,
+        'read_only': ReadSerializer,
+        'write_only': WriteSerializer,
+        'custom': CustomSerializer,
+    }
+
+
+class ChildViewSet(MappedViewSet):
+    serializers = {
+        None: DefaultSerializer,
+        'list': CustomSerializer,
+    }
+
+
+class ClassOnlyViewSet(SerializersMixin, viewsets.GenericViewSet):
+    serializer_class = DefaultSerializer
+
+
+class SerializersMixinTest(SimpleTestCase):
+    def resolve(self, viewset, action, serializer_name=None):
+        view = viewset()
+        view.action = action
+        return view.get_serializer_class(serializer_name=serializer_name)
+
+    def test_resolution_order(self):
+        for action, expected in (
+                ('list', ListSerializer),  # the action wins over its group
+                ('retrieve', ReadSerializer),
+                ('create', WriteSerializer),
+                ('partial_update', WriteSerializer),
+                ('custom', CustomSerializer),
+                ('destroy', DefaultSerializer),
+                ('unknown', DefaultSerializer),
+        ):
+            with self.subTest(action=action):
+                self.assertIs(self.resolve(MappedViewSet, action), expected)
+
+    def test_name_wins_over_action(self):
+        self.assertIs(
+            self.resolve(MappedViewSet, 'list', 'custom'), CustomSerializer,
+        )
+        self.assertIs(
+            self.resolve(MappedViewSet, 'list', 'unknown'), ListSerializer,
+        )
+
+    def test_subclasses_have_own_tables(self):
+        self.assertIs(self.resolve(ChildViewSet, 'list'), CustomSerializer)
+        self.assertIs(self.resolve(ChildViewSet, 'retrieve'), DefaultSerializer)
+        self.assertIs(self.resolve(MappedViewSet, 'list'), ListSerializer)
+        self.assertIs(self.resolve(ClassOnlyViewSet, 'list'), DefaultSerializer)
+        self.assertNotIn('custom', ClassOnlyViewSet.get_serializers_table())
+
+    def test_serializer_class_is_default(self):
+        self.assertIs(self.resolve(ClassOnlyViewSet, 'create'), DefaultSerializer)
+
+    def test_missing_default_raises(self):
+        class NoDefaultViewSet(SerializersMixin, viewsets.GenericViewSet):
+            serializers = {'list': ListSerializer}
+
+        with self.assertRaises(ValueError):
+            NoDefaultViewSet()
+
+    def test_default_key_warns_once(self):
+        class LegacyViewSet(SerializersMixin, viewsets.GenericViewSet):
+            serializers = {'default': DefaultSerializer, 'list': ListSerializer}
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(3):
+                LegacyViewSet()
+        self.assertEqual(len(caught), 1)
+        self.assertIs(self.resolve(LegacyViewSet, 'list'), ListSerializer)
+        self.assertIs(self.resolve(LegacyViewSet, 'create'), DefaultSerializer)
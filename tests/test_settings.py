@@ -0,0 +1,16 @@
+from django.test import SimpleTestCase, override_settings
+
+from gears.settings import get_settings
+
+
+class GetSettingsTest(SimpleTestCase):
+    def test_cached_settings_are_read_only(self):
+        conf = get_settings()
+        with self.assertRaises(TypeError):
+            conf['jwt_private_cache_ttl'] = 0
+        self.assertEqual(get_settings()['jwt_private_cache_ttl'], 300)
+
+    def test_settings_are_reloaded(self):
+        with override_settings(GEARS={'jwt_private_cache_ttl': 10}):
+            self.assertEqual(get_settings()['jwt_private_cache_ttl'], 10)
+        self.assertEqual(get_settings()['jwt_private_cache_ttl'], 300)
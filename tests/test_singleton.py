@@ -0,0 +1,85 @@
+import threading
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from .models import PlainConfig, SiteConfig
+
+
+class CachedSingletonTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        SiteConfig._local_cache = None
+        SiteConfig.update(title='committed')
+
+    def test_warm_reads_make_no_queries(self):
+        SiteConfig.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteConfig.get('title'), 'committed')
+            self.assertEqual(SiteConfig.get().title, 'committed')
+            self.assertEqual(SiteConfig.to_dict()['title'], 'committed')
+
+    def test_stale_local_copy_is_detected_by_version(self):
+        SiteConfig.get()
+        # another process has changed the object and bumped the shared version
+        SiteConfig.objects.update(title='changed')
+        SiteConfig._bump_version(cache)
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteConfig.get('title'), 'changed')
+
+    def test_rolled_back_values_are_not_cached(self):
+        SiteConfig.get()
+        try:
+            with transaction.atomic():
+                SiteConfig.update(title='rolled-back')
+                self.assertEqual(SiteConfig.get('title'), 'rolled-back')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(SiteConfig.get('title'), 'committed')
+        self.assertEqual(SiteConfig.to_dict()['title'], 'committed')
+
+    def test_update_is_visible_inside_transaction(self):
+        SiteConfig.get()
+        with transaction.atomic():
+            SiteConfig.update(title='new')
+            self.assertEqual(SiteConfig.get('title'), 'new')
+        self.assertEqual(SiteConfig.get('title'), 'new')
+
+
+class ConcurrentSingletonTest(TransactionTestCase):
+    threads = 8
+
+    def run_threads(self, target):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+
+        def run(i):
+            try:
+                barrier.wait()
+                target(i)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_first_access_creates_single_object(self):
+        self.run_threads(lambda i: PlainConfig.get())
+        self.assertEqual(PlainConfig.objects.count(), 1)
+        self.assertEqual(PlainConfig.objects.get().pk, PlainConfig.singleton_pk)
+
+    def test_concurrent_updates_keep_each_other(self):
+        self.run_threads(
+            lambda i: PlainConfig.update(**{'title' if i % 2 else 'note': f'v{i % 2}'})
+        )
+        self.assertEqual(PlainConfig.objects.count(), 1)
+        obj = PlainConfig.objects.get()
+        self.assertEqual((obj.title, obj.note), ('v1', 'v0'))